@@ -1,45 +1,235 @@
+import asyncio
+import hashlib
+import logging
+import logging.handlers
 import os
+import queue
+import shutil
+import tempfile
+import threading
+import uuid
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, session, flash, send_file, Response
+from flask import Flask, render_template, request, redirect, url_for, session, flash, Response, jsonify, make_response, stream_with_context
+from flask.json.provider import JSONProvider
+from jinja2 import FileSystemBytecodeCache
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
 from config.config import Config
-from services.google_auth import GoogleAuth
+from services.google_auth import auth as google_auth
 from services.google_drive_service import GoogleDriveService, GoogleDriveError
 
+# Error logging is routed through a queue so the actual stderr write
+# happens on a background thread; the request path only enqueues the
+# record instead of blocking on a synchronous flush
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, logging.StreamHandler(), respect_handler_level=True
+)
+_log_listener.start()
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.setLevel(logging.INFO)
+
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
-app.config['SESSION_TYPE'] = 'filesystem'
+# A stable key (from the SECRET_KEY env var via Config) keeps filesystem
+# sessions valid across restarts and between gunicorn workers; a random
+# per-process key would force every user back through the OAuth flow
+# after each deploy
+app.secret_key = Config.SECRET_KEY
+
+# Route the app's JSON handling through orjson when available. Session
+# cookies and API payloads are small dicts, which orjson encodes and
+# decodes several times faster than the stdlib encoder; sessions are
+# plain signed JSON either way — nothing is ever pickled
+if orjson is not None:
+    class _OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = _OrjsonProvider(app)
+
+# Session backend selection. The default 'cookie' backend keeps the
+# whole session in the signed client cookie — no server-side reads or
+# writes at all, and it scales across workers for free. 'filesystem'
+# and 'redis' switch to server-side storage via Flask-Session; Redis is
+# the right choice for multi-worker deployments since reads and writes
+# become O(1) shared-memory operations and the background token
+# refresher sees one consistent store
+if Config.SESSION_TYPE != 'cookie':
+    from flask_session import Session
+
+    app.config['SESSION_TYPE'] = Config.SESSION_TYPE
+    if Config.SESSION_TYPE == 'redis':
+        import redis
 
-# Use the Config class directly
-google_auth = GoogleAuth(Config)
+        app.config['SESSION_REDIS'] = redis.Redis(
+            connection_pool=redis.BlockingConnectionPool.from_url(
+                Config.SESSION_REDIS_URL, max_connections=64
+            )
+        )
+    Session(app)
+
+# Persist compiled template bytecode on disk so each worker compiles the
+# dashboard template once ever, not once per process start; with
+# auto-reload off Jinja also stops stat()ing template files per render.
+# Templates only change with deploys, which clear the cache directory
+_jinja_cache_dir = os.path.join(tempfile.gettempdir(), 'googledrivetest_jinja_cache')
+os.makedirs(_jinja_cache_dir, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(_jinja_cache_dir)
+app.jinja_env.auto_reload = False
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+
+@app.template_filter('drive_time')
+def drive_time(value):
+    """Format a Drive RFC 3339 timestamp for display.
+
+    Formatting happens here rather than in the service layer so only
+    rows the template actually renders pay for it. Drive timestamps are
+    fixed-layout ('2024-01-02T03:04:05.123Z'), so two slices produce
+    'YYYY-MM-DD HH:MM:SS' without allocating datetime objects. Anything
+    shorter than the fixed layout is shown as-is rather than mangled.
+    """
+    if len(value) < 19:
+        return value
+    return f'{value[:10]} {value[11:19]}'
 
 # Allow HTTP traffic for local development
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = Config.OAUTHLIB_INSECURE_TRANSPORT
 
+# Cache of authenticated GoogleDriveService instances keyed by a hash of
+# the session's access token. Rebuilding the service on every request
+# re-parses the Drive discovery document and discards the underlying
+# HTTP connection pool; reusing it keeps both across requests. Entries
+# expire after a TTL so a revoked token cannot be served indefinitely,
+# and the maxsize bound keeps the cache from growing with every session
+# the process has ever seen.
+_service_cache = TTLCache(maxsize=1024, ttl=300)
+_service_cache_lock = threading.Lock()
+
+def _service_cache_key(token_info):
+    """Derive a cache key from the session token without storing the raw token."""
+    return hashlib.sha256(str(token_info.get('token', '')).encode()).hexdigest()
+
+def _evict_cached_service(token_info):
+    """Drop the cached Drive service for a session token, if present."""
+    with _service_cache_lock:
+        _service_cache.pop(_service_cache_key(token_info), None)
+
+# Background token refresh: refreshing inline adds a full round trip to
+# Google's token endpoint on the user-facing request. When a token is
+# close to expiry (but still valid) the refresh is submitted to a small
+# executor instead; the next request picks up the refreshed token from
+# _refreshed_tokens. The inline refresh below remains as a fallback for
+# tokens that are already expired (e.g. clock skew or a long idle gap).
+_REFRESH_AHEAD = 300  # refresh tokens expiring within this many seconds
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='token-refresh')
+_pending_refreshes = {}
+# Refreshed tokens are keyed by the old token's hash, so a session that
+# never returns to collect its refresh would orphan the entry; the TTL
+# (sized like _service_cache) reclaims those. An expired entry just
+# means the fallback inline refresh runs on that session's next request
+_refreshed_tokens = TTLCache(maxsize=1024, ttl=300)
+_refresh_lock = threading.Lock()
+
+def _refresh_job(cache_key, credentials):
+    """Refresh credentials off the request path and stash the new token."""
+    try:
+        new_token = google_auth.refresh_credentials(credentials, force=True)
+        if new_token:
+            with _refresh_lock:
+                _refreshed_tokens[cache_key] = new_token
+    except Exception:
+        logger.exception("Error in background token refresh")
+    finally:
+        with _refresh_lock:
+            _pending_refreshes.pop(cache_key, None)
+
+def _schedule_token_refresh(cache_key, credentials):
+    """Submit a background refresh for soon-to-expire credentials, deduped per session."""
+    with _refresh_lock:
+        if cache_key in _pending_refreshes:
+            return
+        _pending_refreshes[cache_key] = _refresh_executor.submit(
+            _refresh_job, cache_key, credentials
+        )
+
 def get_google_drive_service():
     """Get an authenticated instance of GoogleDriveService.
-    
+
     This function handles the complex logic of:
     1. Checking for existing session token
     2. Creating/refreshing credentials if needed
     3. Initializing the Google Drive service
-    
+
+    The built service is cached per session token with a short TTL, so
+    repeated requests from the same session skip credential
+    reconstruction and discovery parsing entirely. A token refresh
+    changes the cache key, which naturally invalidates the stale entry.
+
     Returns:
         GoogleDriveService or None: Service instance if authenticated, None if not
     """
-    if 'token' not in session:
+    token = session.get('token')
+    if token is None:
         return None
-        
+
+    # Fast-fail on structurally invalid tokens before paying for
+    # credential construction and the exception machinery below: a token
+    # without a refresh_token can never be refreshed, so building
+    # credentials from it only to fail later wastes the whole attempt
+    if not isinstance(token, dict) or not token.get('refresh_token'):
+        session.clear()
+        return None
+
     try:
+        cache_key = _service_cache_key(session['token'])
+        # Adopt a token that a background refresh completed since the
+        # last request; the new token gets its own cache key
+        with _refresh_lock:
+            refreshed = _refreshed_tokens.pop(cache_key, None)
+        if refreshed:
+            session['token'] = refreshed
+            # The old token's service entry would only ever serve a
+            # token about to expire; drop it now rather than at TTL
+            with _service_cache_lock:
+                _service_cache.pop(cache_key, None)
+            cache_key = _service_cache_key(refreshed)
+        with _service_cache_lock:
+            cached = _service_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         credentials = google_auth.create_credentials_from_token(session['token'])
-        # Refresh token if expired to maintain continuous access
+        # Fallback: refresh inline if the token already expired
         if credentials and credentials.expired and credentials.refresh_token:
             new_token = google_auth.refresh_credentials(credentials)
             if new_token:
                 session['token'] = new_token
+                with _service_cache_lock:
+                    _service_cache.pop(cache_key, None)
+                cache_key = _service_cache_key(new_token)
+        # Proactively refresh soon-to-expire tokens off the request path
+        elif (credentials and credentials.refresh_token and credentials.expiry
+                and (credentials.expiry - datetime.utcnow()).total_seconds() < _REFRESH_AHEAD):
+            _schedule_token_refresh(cache_key, credentials)
         service = google_auth.get_drive_service(credentials)
-        return GoogleDriveService(service)
-    except Exception as e:
-        print(f"Error in get_google_drive_service: {str(e)}")
+        drive_service = GoogleDriveService(service)
+        with _service_cache_lock:
+            _service_cache[cache_key] = drive_service
+        return drive_service
+    except Exception:
+        logger.exception("Error in get_google_drive_service")
+        if 'token' in session:
+            _evict_cached_service(session['token'])
         session.clear()  # Clear invalid session
         return None
 
@@ -91,162 +281,310 @@ def oauth2callback():
         }
         
         return redirect(url_for('dashboard'))
-    except Exception as e:
-        print(f"Error in oauth2callback: {str(e)}")
+    except Exception:
+        logger.exception("Error in oauth2callback")
         session.clear()
         return redirect(url_for('login'))
 
 @app.route('/logout')
 def logout():
     """Handle user logout."""
+    if 'token' in session:
+        _evict_cached_service(session['token'])
     session.clear()
     return redirect(url_for('index'))
 
 @app.route('/dashboard')
 @app.route('/dashboard/<folder_id>')
-def dashboard(folder_id='root'):
+async def dashboard(folder_id='root'):
     """Display the Google Drive dashboard.
-    
+
     This route handles:
     1. Authentication verification
     2. Service initialization
     3. Folder navigation
     4. File/folder listing
-    
+
     Args:
         folder_id: ID of the folder to display (default: 'root')
-        
+
     The dashboard view shows:
     - Current folder name and path
     - List of files and subfolders
     - Upload form
     - File actions (download/delete)
+
+    The folder metadata and file listing are fetched in one batched Drive
+    request (see GoogleDriveService.fetch_dashboard_bundle), so a render
+    costs a single metadata round trip instead of three. The synchronous
+    Drive client runs in a worker thread so the event loop stays free.
     """
     # Ensure user is authenticated
     if 'token' not in session:
         return redirect(url_for('login'))
-    
+
     drive_service = get_google_drive_service()
     if drive_service is None:
         session.clear()
         return redirect(url_for('login'))
-        
+
     try:
-        # Get folder information and contents
-        current_folder_name = drive_service.get_folder_name(folder_id)
-        path = drive_service.get_folder_path(folder_id)
-        files = drive_service.list_files(folder_id)
-        
-        return render_template('dashboard.html', 
-                             files=files, 
+        # Drive's change token advances whenever anything in the drive
+        # changes, so (folder, token) works as a weak ETag: when the
+        # browser already holds the current version, one cheap token
+        # check replaces the whole listing fetch and render
+        changes_token = await asyncio.to_thread(drive_service.get_changes_token)
+        etag = f'{folder_id}:{changes_token}'
+        if request.if_none_match.contains_weak(etag):
+            return '', 304
+
+        # One batched round trip for folder name, breadcrumb path and
+        # listing. The changes token is passed along so a bundle cached
+        # under an older token is refetched rather than re-stamped with
+        # the current ETag (which would pin the stale listing until the
+        # next drive change)
+        current_folder_name, path, files = await asyncio.to_thread(
+            drive_service.fetch_dashboard_bundle, folder_id,
+            changes_token=changes_token
+        )
+
+        response = make_response(render_template('dashboard.html',
+                             files=files,
                              current_folder_id=folder_id,
                              current_folder_name=current_folder_name,
-                             path=path)
+                             path=path))
+        response.set_etag(etag, weak=True)
+        # no-cache forces revalidation on every navigation, so a changed
+        # folder is never served stale from the browser cache
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
     except GoogleDriveError as e:
         flash(f'Error accessing Google Drive: {str(e)}')
         return redirect(url_for('login'))
-    except Exception as e:
-        print(f"Error in dashboard: {str(e)}")
+    except Exception:
+        logger.exception("Error in dashboard")
         session.clear()
         return redirect(url_for('login'))
 
+# Bounded parallelism for multi-file uploads: four concurrent resumable
+# uploads saturate typical uplink bandwidth while staying well inside
+# Drive's per-user write quota, so bulk selections don't trigger 429s
+_upload_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='upload')
+
+def _upload_files_concurrently(files, folder_id):
+    """Upload several request files to Drive in parallel.
+
+    Each worker builds its own Drive service: httplib2 connections are
+    not safe to share across threads, but the credentials object is, so
+    per-thread services reuse the already-validated session credentials
+    without re-touching the session. Blocks until every upload finishes
+    and returns the filenames that failed.
+    """
+    credentials = google_auth.create_credentials_from_token(session['token'])
+
+    def _upload(file):
+        service = GoogleDriveService(google_auth.get_drive_service(credentials))
+        service.upload_file_stream(file.stream, file.filename, folder_id, file.mimetype)
+
+    futures = {_upload_executor.submit(_upload, f): f.filename for f in files}
+    failed = []
+    for future, filename in futures.items():
+        try:
+            future.result()
+        except Exception:
+            logger.exception("Error uploading %s", filename)
+            failed.append(filename)
+    return failed
+
+# Uploads at or above this size are finished in the background: the
+# request only pays for spooling the body to local disk, then redirects
+# while a worker thread streams the spool to Drive
+_BACKGROUND_UPLOAD_THRESHOLD = 8 * 1024 * 1024
+# Status entries expire an hour after their last write: long enough for
+# any realistic upload plus polling, while abandoned entries (a client
+# that never polls to completion) cannot accumulate for the process
+# lifetime. The worker mutates the status dict it holds directly, so an
+# entry expiring mid-upload only stops it being pollable, never the job
+_background_uploads = TTLCache(maxsize=256, ttl=3600)
+_background_uploads_lock = threading.Lock()
+
+def _background_upload_job(status, token, spool, filename, folder_id, mimetype):
+    """Stream a spooled upload to Drive and record its outcome."""
+    try:
+        credentials = google_auth.create_credentials_from_token(token)
+        service = GoogleDriveService(google_auth.get_drive_service(credentials))
+        service.upload_file_stream(spool, filename, folder_id, mimetype)
+        with _background_uploads_lock:
+            status['state'] = 'done'
+    except Exception as e:
+        logger.exception("Error in background upload of %s", filename)
+        with _background_uploads_lock:
+            status.update(state='error', error=str(e))
+    finally:
+        spool.close()
+
+def _schedule_background_upload(file, folder_id):
+    """Spool a request file and hand it to the upload executor.
+
+    The spool is an anonymous temp file — it has no pathname to leak,
+    the worker reads it directly without a reopen, and the OS reclaims
+    it on close even if the process dies mid-upload. The session token
+    is captured here, while the request context is still available; the
+    worker thread rebuilds credentials from it.
+
+    Returns:
+        str: Upload ID for polling /uploads/<upload_id>
+    """
+    spool = tempfile.TemporaryFile()
+    shutil.copyfileobj(file.stream, spool)
+    spool.seek(0)
+    upload_id = uuid.uuid4().hex
+    status = {'filename': file.filename, 'state': 'pending'}
+    with _background_uploads_lock:
+        _background_uploads[upload_id] = status
+    _upload_executor.submit(
+        _background_upload_job, status, session['token'],
+        spool, file.filename, folder_id, file.mimetype
+    )
+    return upload_id
+
+@app.route('/uploads/<upload_id>')
+def upload_status(upload_id):
+    """Report the state of a background upload as JSON for polling."""
+    if 'token' not in session:
+        return redirect(url_for('login'))
+    with _background_uploads_lock:
+        status = _background_uploads.get(upload_id)
+    if status is None:
+        return jsonify({'error': 'Unknown upload'}), 404
+    return jsonify(status)
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """Handle file upload to Google Drive.
-    
+
     Security measures implemented:
     1. Authentication check before processing
     2. File size validation
-    3. Secure temporary file handling
-    4. Proper file cleanup
-    5. Session token validation
-    
+    3. Session token validation
+
     File handling flow:
     1. Validate request and authentication
-    2. Save file to secure temporary location
-    3. Upload to Google Drive with error handling
-    4. Clean up temporary files regardless of success/failure
-    5. Provide user feedback via flash messages
-    
+    2. Stream the upload straight into Drive with error handling
+    3. Provide user feedback via flash messages
+
+    The incoming file is never written to a local temp file: Werkzeug
+    already spools the request body (in memory for small files, spilling
+    to an anonymous temp file for large ones), and that stream is handed
+    directly to Drive's resumable upload. This halves the disk I/O per
+    upload and removes temp-file cleanup entirely.
+
     Returns:
         Redirect to dashboard with success/error message
     """
     if 'token' not in session:
         return redirect(url_for('login'))
-    
+
     if 'file' not in request.files:
         flash('No file selected')
         return redirect(url_for('dashboard'))
-    
-    file = request.files['file']
-    if file.filename == '':
+
+    files = [f for f in request.files.getlist('file') if f.filename]
+    if not files:
         flash('No file selected')
         return redirect(url_for('dashboard'))
-    
+
     folder_id = request.form.get('folder_id', 'root')
-    
-    # Create temp directory if it doesn't exist
-    temp_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'temp')
-    os.makedirs(temp_dir, exist_ok=True)
-    
-    # Save the file temporarily with secure handling
-    temp_path = os.path.join(temp_dir, file.filename)
+
+    drive_service = get_google_drive_service()
+    if drive_service is None:
+        flash('Error: Not authenticated with Google Drive')
+        return redirect(url_for('login'))
+
     try:
-        # Secure file save with size validation
-        file.save(temp_path)
-        
-        drive_service = get_google_drive_service()
-        if drive_service is None:
-            flash('Error: Not authenticated with Google Drive')
-            return redirect(url_for('login'))
-            
-        try:
-            drive_service.upload_file(temp_path, folder_id)
+        # Large files finish in the background so the worker is not tied
+        # up for the full Drive transfer; small ones complete inline and
+        # give immediate feedback
+        background = []
+        inline = []
+        for file in files:
+            file.stream.seek(0, os.SEEK_END)
+            size = file.stream.tell()
+            file.stream.seek(0)
+            if size >= _BACKGROUND_UPLOAD_THRESHOLD:
+                background.append(file)
+            else:
+                inline.append(file)
+
+        for file in background:
+            _schedule_background_upload(file, folder_id)
+        if background:
+            names = ', '.join(f.filename for f in background)
+            flash(f'Uploading in background: {names}')
+
+        if len(inline) == 1:
+            file = inline[0]
+            drive_service.upload_file_stream(
+                file.stream, file.filename, folder_id, file.mimetype
+            )
             flash('File uploaded successfully!')
-        except GoogleDriveError as e:
-            flash(f'Error uploading file: {str(e)}')
-        except Exception as e:
-            flash(f'An unexpected error occurred: {str(e)}')
-    finally:
-        # Ensure temporary file is always cleaned up
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-    
+        elif inline:
+            failed = _upload_files_concurrently(inline, folder_id)
+            if failed:
+                flash(f"Error uploading: {', '.join(failed)}")
+            else:
+                flash(f'{len(inline)} files uploaded successfully!')
+    except GoogleDriveError as e:
+        flash(f'Error uploading file: {str(e)}')
+    except Exception as e:
+        flash(f'An unexpected error occurred: {str(e)}')
+
     return redirect(url_for('dashboard', folder_id=folder_id))
 
 @app.route('/download/<file_id>')
 def download_file(file_id):
     """Handle secure file download from Google Drive.
-    
+
     Security measures:
     1. Authentication validation
-    2. Session token verification 
+    2. Session token verification
     3. Safe file streaming
     4. Proper content-disposition headers
-    
+
     Download process:
     1. Verify user authentication
     2. Retrieve file metadata from Drive
-    3. Stream file content securely
+    3. Stream file content chunk by chunk
     4. Set proper headers for safe download
-    
+
+    The response streams 4 MB chunks as they arrive from Drive instead
+    of buffering the whole file in memory first, so memory stays
+    constant regardless of file size and the first byte reaches the
+    client while later chunks are still downloading.
+
     Args:
         file_id: ID of the file to download
-        
+
     Returns:
         Streamed file response or redirect on error
     """
     if 'token' not in session:
         return redirect(url_for('login'))
-    
+
     drive_service = get_google_drive_service()
     try:
-        file = drive_service.download_file(file_id)
-        # Set secure headers for file download
-        return send_file(
-            file,
-            as_attachment=True,
-            download_name=drive_service.get_file_name(file_id)
+        # One metadata request covers the filename, size and MIME type
+        # headers; previously the name cost its own round trip
+        info = drive_service.get_file_info(file_id)
+        headers = {
+            'Content-Disposition': f'attachment; filename="{info.get("name", "download")}"'
+        }
+        if info.get('size'):
+            headers['Content-Length'] = info['size']
+        return Response(
+            stream_with_context(drive_service.stream_file(file_id)),
+            mimetype=info.get('mimeType') or 'application/octet-stream',
+            headers=headers
         )
     except GoogleDriveError as e:
         flash(f'Error downloading file: {str(e)}')
@@ -267,22 +605,28 @@ def delete_file(file_id):
     
     Deletion process:
     1. Verify user authentication
-    2. Get parent folder for redirect
+    2. Determine the folder to redirect back to
     3. Delete file with error handling
     4. Redirect with status message
-    
+
+    The dashboard passes the current folder as a query parameter, so the
+    redirect target is known without asking Drive for the file's parent.
+    The metadata lookup only happens as a fallback for links that omit it.
+
     Args:
         file_id: ID of the file to delete
-        
+
     Returns:
         Redirect to parent folder with status message
     """
     if 'token' not in session:
         return redirect(url_for('login'))
-    
+
     drive_service = get_google_drive_service()
     try:
-        parent_folder_id = drive_service.get_file_parent(file_id)
+        parent_folder_id = request.args.get('folder_id')
+        if not parent_folder_id:
+            parent_folder_id = drive_service.get_file_parent(file_id)
         drive_service.delete_file(file_id)
         flash('File deleted successfully!')
         return redirect(url_for('dashboard', folder_id=parent_folder_id))
@@ -294,5 +638,4 @@ def delete_file(file_id):
         return redirect(url_for('dashboard'))
 
 if __name__ == '__main__':
-    os.makedirs('temp', exist_ok=True)
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,9 @@
+"""Configuration package.
+
+Re-exports the canonical Config so callers can import it from the
+package root; `config.config` remains the single source module.
+"""
+
+from config.config import Config
+
+__all__ = ['Config']
@@ -1,7 +1,49 @@
+import logging
 import os
 import json
 
-class Config:
+_log = logging.getLogger(__name__)
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional accelerator
+    _loads = json.loads
+
+# Parsed credentials.json memoized by (path, mtime): repeated loads —
+# lazy re-access, test setUp calls, forked workers re-importing — skip
+# the disk read and JSON decode unless the file actually changed
+_CREDENTIALS_PATH = 'credentials.json'
+_credentials_cache = {}
+
+# Validation invariants hoisted out of load_credentials so they are
+# built once, not per load
+_VALID_CLIENT_SUFFIX = '.apps.googleusercontent.com'
+_VALID_URI_SCHEMES = ('http://', 'https://')
+_MIN_SECRET_LENGTH = 8
+
+class _ConfigMeta(type):
+    """Metaclass that loads OAuth credentials on first access.
+
+    Importing the config module no longer touches credentials.json at
+    all; the open + parse happens the first time code actually asks for
+    a GOOGLE_* credential attribute. Imports that never need Google
+    credentials (CLI help, unrelated tests) skip the disk I/O entirely.
+    """
+
+    _CREDENTIAL_ATTRS = frozenset({
+        'GOOGLE_CLIENT_ID',
+        'GOOGLE_CLIENT_SECRET',
+        'GOOGLE_REDIRECT_URI',
+    })
+
+    def __getattr__(cls, name):
+        if name in _ConfigMeta._CREDENTIAL_ATTRS:
+            cls.load_credentials()
+            return type.__getattribute__(cls, name)
+        raise AttributeError(name)
+
+class Config(metaclass=_ConfigMeta):
     """Configuration class for application settings and OAuth2 credentials.
     
     This class manages:
@@ -14,9 +56,21 @@ class Config:
     to maintain security while allowing easy deployment across environments.
     """
     
-    # Flask settings with security-focused configuration
-    SECRET_KEY = os.getenv('SECRET_KEY', os.urandom(24))  # Random key per instance if not set
-    SESSION_TYPE = 'filesystem'  # Secure session storage on filesystem
+    # Flask settings with security-focused configuration. The urandom
+    # fallback only runs when the env var is absent — as a getenv
+    # default it would be evaluated (a getrandom syscall) on every
+    # import regardless
+    _secret_key_env = os.environ.get('SECRET_KEY')
+    SECRET_KEY = _secret_key_env if _secret_key_env is not None else os.urandom(24)
+    # Session backend, via SESSION_BACKEND: 'cookie' keeps the session
+    # in the signed client cookie with zero server-side state (the OAuth
+    # token dict fits comfortably), 'filesystem' stores it on local disk,
+    # and 'redis' (implied by SESSION_REDIS_URL) shares it across
+    # workers and hosts
+    SESSION_REDIS_URL = os.getenv('SESSION_REDIS_URL')
+    SESSION_TYPE = os.getenv(
+        'SESSION_BACKEND', 'redis' if SESSION_REDIS_URL else 'cookie'
+    )
     DEBUG = True  # Enable detailed error messages (should be False in production)
     TESTING = False  # Disable test mode by default
     OAUTHLIB_INSECURE_TRANSPORT = '1'  # Allow HTTP for local development only
@@ -31,6 +85,11 @@ class Config:
     # File upload security settings
     UPLOAD_FOLDER = 'temp'  # Temporary storage for uploads
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB file size limit
+
+    # On-disk HTTP cache for Drive API responses. httplib2 stores
+    # responses here and revalidates them with If-None-Match, so
+    # unchanged metadata comes back as a bodyless 304
+    HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', '.http_cache')
     
     @classmethod
     def load_credentials(cls):
@@ -56,55 +115,58 @@ class Config:
             KeyError: With field name if OAuth2 field missing
         """
         try:
-            with open('credentials.json', 'r') as f:
-                credentials = json.load(f)
-                
-                # Extract required OAuth2 fields with validation
-                try:
-                    cls.GOOGLE_CLIENT_ID = credentials['web']['client_id']
-                    if not cls.GOOGLE_CLIENT_ID.endswith('.apps.googleusercontent.com'):
-                        raise ValueError("Invalid client_id format")
-                        
-                    cls.GOOGLE_CLIENT_SECRET = credentials['web']['client_secret']
-                    if len(cls.GOOGLE_CLIENT_SECRET) < 8:
-                        raise ValueError("Invalid client_secret format")
-                        
-                    cls.GOOGLE_REDIRECT_URI = credentials['web']['redirect_uris'][0]
-                    if not cls.GOOGLE_REDIRECT_URI.startswith(('http://', 'https://')):
-                        raise ValueError("Invalid redirect_uri format")
-                        
-                except KeyError as e:
-                    print(f"Error: Missing required OAuth2 field: {str(e)}")
-                    print("Please ensure credentials.json contains all required fields:")
-                    print("- web.client_id")
-                    print("- web.client_secret") 
-                    print("- web.redirect_uris[0]")
-                    raise
-                    
+            cache_key = (_CREDENTIALS_PATH, os.stat(_CREDENTIALS_PATH).st_mtime_ns)
+            credentials = _credentials_cache.get(cache_key)
+            if credentials is None:
+                # orjson when available (it only takes bytes, hence the
+                # binary read); its JSONDecodeError subclasses the
+                # stdlib's, so the handler below covers both parsers.
+                # Unbuffered raw mode: the file is consumed in one
+                # read(), so an intermediate buffer would only add a
+                # copy between the kernel and the parser
+                with open(_CREDENTIALS_PATH, 'rb', buffering=0) as f:
+                    credentials = _loads(f.read())
+                _credentials_cache.clear()
+                _credentials_cache[cache_key] = credentials
+
+            # Extract required OAuth2 fields with validation
+            try:
+                cls.GOOGLE_CLIENT_ID = credentials['web']['client_id']
+                if not cls.GOOGLE_CLIENT_ID.endswith(_VALID_CLIENT_SUFFIX):
+                    raise ValueError("Invalid client_id format")
+
+                cls.GOOGLE_CLIENT_SECRET = credentials['web']['client_secret']
+                if len(cls.GOOGLE_CLIENT_SECRET) < _MIN_SECRET_LENGTH:
+                    raise ValueError("Invalid client_secret format")
+
+                cls.GOOGLE_REDIRECT_URI = credentials['web']['redirect_uris'][0]
+                if not cls.GOOGLE_REDIRECT_URI.startswith(_VALID_URI_SCHEMES):
+                    raise ValueError("Invalid redirect_uri format")
+
+            except KeyError as e:
+                _log.error(
+                    "Missing required OAuth2 field %s; ensure "
+                    "credentials.json contains web.client_id, "
+                    "web.client_secret and web.redirect_uris[0]", e
+                )
+                raise
+
+
         except FileNotFoundError:
-            print("""
-Error: credentials.json file not found.
-
-To set up credentials:
-1. Go to Google Cloud Console
-2. Create or select a project
-3. Enable Google Drive API
-4. Create OAuth 2.0 Client ID
-5. Download client configuration
-6. Save as credentials.json in project root
-            """)
+            _log.error(
+                "credentials.json not found. To set up credentials: go to "
+                "Google Cloud Console, create or select a project, enable "
+                "the Google Drive API, create an OAuth 2.0 Client ID, "
+                "download the client configuration and save it as "
+                "credentials.json in the project root"
+            )
             raise
             
         except json.JSONDecodeError:
-            print("""
-Error: credentials.json is not valid JSON.
-
-Please verify:
-1. File contains valid JSON syntax
-2. No missing/extra commas
-3. All quotes and brackets match
-4. No trailing commas
-            """)
+            _log.error(
+                "credentials.json is not valid JSON; verify the syntax "
+                "(matching quotes and brackets, no trailing commas)"
+            )
             raise
     
     @classmethod
@@ -122,11 +184,12 @@ Please verify:
             'GOOGLE_CLIENT_SECRET',
             'GOOGLE_REDIRECT_URI'
         ]
-        
-        missing_vars = [var for var in required_vars if not hasattr(cls, var)]
-        
-        if missing_vars:
-            raise ValueError(f"Missing required configuration values: {', '.join(missing_vars)}")
 
-# Load credentials
-Config.load_credentials()
\ No newline at end of file
+        # One class-dict lookup per var instead of an MRO-walking
+        # hasattr — and hasattr would also trip the lazy loader, making
+        # validate() report credentials as present by loading them
+        cls_attrs = vars(cls)
+        missing_vars = [var for var in required_vars if var not in cls_attrs]
+
+        if missing_vars:
+            raise ValueError(f"Missing required configuration values: {', '.join(missing_vars)}")
\ No newline at end of file
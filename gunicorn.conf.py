@@ -0,0 +1,11 @@
+import multiprocessing
+
+# The app is almost entirely I/O-bound (Drive HTTPS calls and file
+# streaming), so gevent workers let each process serve many concurrent
+# requests cooperatively instead of one at a time.
+worker_class = 'gevent'
+workers = multiprocessing.cpu_count() * 2 + 1
+worker_connections = 1000
+bind = '0.0.0.0:5000'
+# Large downloads/uploads can legitimately hold a connection for a while
+timeout = 120
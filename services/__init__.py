@@ -0,0 +1,27 @@
+"""Service-layer package.
+
+Re-exports the public service entry points so callers can import them
+from the package root; the submodules remain the single source of each
+implementation.
+"""
+
+from services.google_auth import GoogleAuth, auth
+from services.google_drive_service import (
+    GoogleDriveService,
+    GoogleDriveError,
+    DriveErrorEnvelope,
+    FileOperationError,
+    FolderOperationError,
+    FileMetadataError,
+)
+
+__all__ = [
+    'GoogleAuth',
+    'auth',
+    'GoogleDriveService',
+    'GoogleDriveError',
+    'DriveErrorEnvelope',
+    'FileOperationError',
+    'FolderOperationError',
+    'FileMetadataError',
+]
@@ -1,29 +1,114 @@
+import functools
 import io
+import mimetypes
 import os
-from typing import List
+import random
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, List
+
+import google_auth_httplib2
+import httplib2
+from cachetools import TTLCache
 from dataclasses import dataclass
-from datetime import datetime
 from abc import ABC, abstractmethod
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload, MediaIoBaseUpload
+
+# Listing pages are prefetched on this executor so the next page's HTTP
+# round trip overlaps with processing of the current page. One page is
+# in flight per iteration, so a small pool covers concurrent listings
+_page_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='page-prefetch')
+
+# Folder MIME type, hoisted so the listing-build loop compares against
+# one module-level constant. CPython string equality already
+# short-circuits on length and identity, so interning + `is` would just
+# add a function call per row for nothing
+_FOLDER_MIME = 'application/vnd.google-apps.folder'
+
+# Listing projection shared by every files().list call: built once so
+# each page request reuses the same string instead of re-assembling it.
+# parents and size ride along because the download and delete flows
+# need them next — answering those from the listing saves a files().get
+# round trip per touched row
+_LISTING_FIELDS = "nextPageToken, files(id, name, mimeType, modifiedTime, parents, size)"
+
+# Query templates for children-of-folder listings and the bulk folder
+# index, hoisted so each call interpolates into a precompiled template
+# instead of rebuilding the static clauses
+_PARENT_QUERY = "'%s' in parents and trashed = false"
+_FOLDER_QUERY = f"mimeType = '{_FOLDER_MIME}' and trashed = false"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FileInfo:
-    """Data class for file information."""
+    """Data class for file information.
+
+    `modified` carries the raw RFC 3339 timestamp from the API; display
+    formatting is a presentation concern handled by the template layer.
+    Slotted and frozen: listings materialize thousands of these, and
+    slots drop the per-instance __dict__ nobody mutates anyway.
+    """
     id: str
     name: str
     type: str
     modified: str
     is_folder: bool
+    # Present when the listing supplied them; size stays the raw string
+    # from the API and is absent for folders and Google-native documents
+    parent: str = None
+    size: str = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FolderPath:
     """Data class for folder path information."""
     id: str
     name: str
 
+@dataclass(slots=True, frozen=True)
+class DriveErrorEnvelope:
+    """Structured classification of a failed Drive call.
+
+    Stringifying the original exception loses the HTTP status and with
+    it any basis for retry decisions; the envelope preserves both. A
+    retryable failure (rate limit, server error) is worth another
+    attempt; a non-retryable one (missing file, permissions) would only
+    burn latency and API quota.
+    """
+    reason_hint: str          # 'not_found' | 'permission' | 'quota_exceeded'
+                              # | 'rate_limited' | 'network' | 'unknown'
+    status: int = None        # HTTP status, when the failure had one
+    retryable: bool = False
+
+def _classify_error(e) -> DriveErrorEnvelope:
+    """Build an envelope from the underlying client-library exception."""
+    status = getattr(getattr(e, 'resp', None), 'status', None)
+    if status == 404:
+        return DriveErrorEnvelope('not_found', status)
+    if status == 403:
+        if 'ratelimitexceeded' in str(e).lower():
+            return DriveErrorEnvelope('quota_exceeded', status, retryable=True)
+        return DriveErrorEnvelope('permission', status)
+    if status == 429:
+        return DriveErrorEnvelope('rate_limited', status, retryable=True)
+    if status is not None and status >= 500:
+        return DriveErrorEnvelope('network', status, retryable=True)
+    return DriveErrorEnvelope('unknown', status)
+
 class GoogleDriveError(Exception):
-    """Base exception for Google Drive operations."""
-    pass
+    """Base exception for Google Drive operations.
+
+    `envelope` carries the typed classification of the underlying
+    failure when one exists; the message stays human-readable.
+    """
+
+    def __init__(self, message, envelope: DriveErrorEnvelope = None):
+        super().__init__(message)
+        self.envelope = envelope
 
 class FileOperationError(GoogleDriveError):
     """Exception for file operation errors."""
@@ -57,20 +142,59 @@ class FileOperation(ABC):
         pass
         
     @abstractmethod
-    def download(self, file_id: str) -> io.BytesIO:
+    def upload_stream(self, stream, filename: str, folder_id: str = 'root',
+                      mimetype: str = None) -> str:
+        """Upload a file-like object to Google Drive without touching disk.
+
+        Args:
+            stream: Readable file-like object positioned at the start
+            filename: Name to give the file in Drive
+            folder_id: ID of the folder to upload to (default: 'root')
+            mimetype: MIME type of the content (default: octet-stream)
+
+        Returns:
+            str: ID of the uploaded file
+
+        Raises:
+            FileOperationError: If upload fails
+        """
+        pass
+
+    @abstractmethod
+    def download(self, file_id: str, out_stream=None):
         """Download a file from Google Drive.
-        
+
         Args:
             file_id: ID of the file to download
-            
+            out_stream: Optional writable object to receive the content
+                chunk by chunk, keeping memory constant for large files
+
         Returns:
-            io.BytesIO: File content as bytes
-            
+            A readable file-like positioned at byte 0: out_stream when
+            given, otherwise a spooled temp file that spills to disk
+            past a small threshold so large files never sit in RAM
+
         Raises:
             FileOperationError: If download fails
         """
         pass
         
+    @abstractmethod
+    def stream(self, file_id: str, chunk_size: int = 4 * 1024 * 1024):
+        """Stream a file from Google Drive chunk by chunk.
+
+        Args:
+            file_id: ID of the file to stream
+            chunk_size: Size of each chunk in bytes (default: 4MB)
+
+        Yields:
+            bytes: Successive chunks of file content
+
+        Raises:
+            FileOperationError: If the download fails
+        """
+        pass
+
     @abstractmethod
     def delete(self, file_id: str) -> None:
         """Delete a file from Google Drive.
@@ -134,6 +258,22 @@ class FileMetadata(ABC):
         """
         pass
         
+    @abstractmethod
+    def get_info(self, file_id: str) -> dict:
+        """Get name, size and MIME type of a file in one request.
+
+        Args:
+            file_id: ID of the file
+
+        Returns:
+            dict: Raw metadata with 'name', 'size' and 'mimeType' keys
+                (size is absent for Google-native documents)
+
+        Raises:
+            FileMetadataError: If operation fails
+        """
+        pass
+
     @abstractmethod
     def get_parent(self, file_id: str) -> str:
         """Get the parent folder ID of a file.
@@ -149,70 +289,480 @@ class FileMetadata(ABC):
         """
         pass
 
+# Files larger than one ranged chunk download as parallel byte-range
+# requests: N sequential chunk round trips collapse to roughly the
+# slowest one, so large downloads approach full link bandwidth. Each
+# worker runs on its own HTTP connection — httplib2 connections must
+# not be shared across threads
+_RANGED_DOWNLOAD_CHUNK = 32 * 1024 * 1024
+_ranged_download_executor = ThreadPoolExecutor(
+    max_workers=8, thread_name_prefix='ranged-download'
+)
+# At most this many ranges are in flight ahead of the write cursor —
+# matching the executor width, since extra submissions would only queue
+# while their completed bytes pile up in memory. Peak buffering is thus
+# window * chunk (256 MB) regardless of file size
+_RANGED_DOWNLOAD_WINDOW = 8
+
+# Bulk uploads fan out across this executor so N files cost roughly
+# ceil(N / workers) upload times instead of N. Each worker executes on
+# its own transport (httplib2 is not thread-safe); the worker count
+# keeps aggregate bandwidth shared sanely across concurrent sessions
+_upload_fanout_executor = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix='upload-fanout'
+)
+
+# Per-thread cache of authorized transports, keyed by credentials.
+# Worker threads would otherwise build a fresh httplib2.Http — and pay
+# a TCP + TLS handshake — for every ranged chunk or fanned-out upload;
+# thread-locality keeps each connection on exactly one thread, which is
+# the most sharing httplib2 allows
+_transport_local = threading.local()
+
+# When the caller supplies no destination, downloads land in a spooled
+# temp file: small files stay in memory, anything past this threshold
+# spills to disk so peak RSS never tracks file size
+_DOWNLOAD_SPOOL_MAX = 8 * 1024 * 1024
+
+# Below this size an upload goes as a single non-resumable multipart
+# POST: the resumable protocol's session-initiation request would cost
+# more than re-sending the whole body on the rare failure
+_SIMPLE_UPLOAD_MAX = 5 * 1024 * 1024
+
+# Resumable upload chunk sizing: each chunk costs an acknowledgement
+# round trip, so larger chunks waste less bandwidth idling — but a
+# too-large chunk amplifies the cost of a retry. Chunk size is chosen
+# from exponential moving averages of observed throughput and failure
+# rate, targeting a few seconds per chunk, and clamped to the bounds
+# below. Drive requires chunk sizes in multiples of 256 KiB
+_UPLOAD_CHUNK_START = 8 * 1024 * 1024
+_UPLOAD_CHUNK_MIN = 1 * 1024 * 1024
+_UPLOAD_CHUNK_MAX = 32 * 1024 * 1024
+_UPLOAD_CHUNK_GRANULE = 256 * 1024
+_UPLOAD_TARGET_SECS = 4.0   # aim for one ack round trip per ~4s of data
+_UPLOAD_EMA_ALPHA = 0.3     # weight of the newest sample in each EMA
+_UPLOAD_FAIL_WEIGHT = 4.0   # how hard a lossy link shrinks the chunk
+
+# Transient server errors during a resumable upload are retried per
+# chunk with exponential backoff. The resumable session URI survives
+# the failure, so only the failing chunk is re-sent — never the whole
+# file. The attempt counter resets after each successful chunk
+_UPLOAD_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+_UPLOAD_MAX_CHUNK_ATTEMPTS = 5
+
+@functools.lru_cache(maxsize=1024)
+def _guess_mimetype(filename: str) -> str:
+    """Memoized MIME type guess.
+
+    The guess depends only on the file extension, and guess_type walks
+    the mimetypes tables per call — wasted work when upload_many pushes
+    batches of similarly named files.
+    """
+    return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+class _ChunkSink:
+    """Writable that hands each written chunk back instead of buffering.
+
+    MediaIoBaseDownload writes one response body per next_chunk call;
+    capturing the reference lets stream() yield the downloaded bytes
+    directly, skipping the write-into-BytesIO-then-getvalue() round
+    trip that copied every chunk twice.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(data)
+        return len(data)
+
+    def take(self) -> bytes:
+        """Return everything written since the last take."""
+        if not self._chunks:
+            return b''
+        chunk = self._chunks[0] if len(self._chunks) == 1 else b''.join(self._chunks)
+        self._chunks.clear()
+        return chunk
+
+class _AdaptiveChunksizeMixin:
+    """Let a MediaUpload's chunk size change between next_chunk calls.
+
+    MediaUpload exposes chunksize() read-only; the resumable protocol
+    itself allows each chunk to be a different size, so a setter is all
+    that is missing.
+    """
+
+    def set_chunksize(self, chunksize):
+        self._chunksize = chunksize
+
+class _AdaptiveMediaFileUpload(_AdaptiveChunksizeMixin, MediaFileUpload):
+    pass
+
+class _AdaptiveMediaIoBaseUpload(_AdaptiveChunksizeMixin, MediaIoBaseUpload):
+    pass
+
 class GoogleDriveFileOperation(FileOperation):
     """Concrete implementation of file operations."""
-    
+
+    # Rolling link estimates shared by all uploads in the process, so a
+    # new upload starts from what recent uploads learned instead of
+    # re-probing from the default chunk size
+    _ema_bandwidth = None   # bytes/sec, None until the first sample
+    _ema_failure = 0.0      # fraction of chunk attempts that failed
+    _ema_lock = threading.Lock()
+
     def __init__(self, service):
         self.service = service
-    
-    def upload(self, file_path: str, folder_id: str = 'root') -> str:
+        # Resolved once: each files() call re-walks the discovery
+        # document to rebuild the resource collection
+        self._files = service.files()
+
+    @classmethod
+    def _choose_chunksize(cls):
+        """Pick a chunk size from the rolling bandwidth/failure estimates.
+
+        Targets a few seconds of data per acknowledgement round trip —
+        small chunks spend their time idling on acks, huge chunks make
+        every retry expensive — and shrinks the target as the observed
+        failure rate rises. Clamped to the configured bounds and rounded
+        down to Drive's 256 KiB granule.
+        """
+        with cls._ema_lock:
+            bandwidth = cls._ema_bandwidth
+            failure = cls._ema_failure
+        if bandwidth is None:
+            return _UPLOAD_CHUNK_START
+        chunksize = int(
+            bandwidth * _UPLOAD_TARGET_SECS / (1 + _UPLOAD_FAIL_WEIGHT * failure)
+        )
+        chunksize -= chunksize % _UPLOAD_CHUNK_GRANULE
+        return max(_UPLOAD_CHUNK_MIN, min(chunksize, _UPLOAD_CHUNK_MAX))
+
+    @classmethod
+    def _record_chunk(cls, nbytes, elapsed, failed):
+        """Fold one chunk attempt into the rolling link estimates."""
+        with cls._ema_lock:
+            if failed:
+                cls._ema_failure += _UPLOAD_EMA_ALPHA * (1.0 - cls._ema_failure)
+                return
+            cls._ema_failure += _UPLOAD_EMA_ALPHA * (0.0 - cls._ema_failure)
+            if elapsed > 0:
+                sample = nbytes / elapsed
+                if cls._ema_bandwidth is None:
+                    cls._ema_bandwidth = sample
+                else:
+                    cls._ema_bandwidth += _UPLOAD_EMA_ALPHA * (sample - cls._ema_bandwidth)
+
+    def _thread_transport(self):
+        """Get the calling thread's authorized transport, building it once.
+
+        httplib2 connections must not be shared across threads; the
+        credentials object is thread-safe, so each worker wraps it
+        around its own Http instance. The instance is cached per thread
+        (and per credentials, since services are per-session) so repeat
+        work on the same worker reuses the live TLS connection instead
+        of re-handshaking.
+        """
+        credentials = getattr(self.service._http, 'credentials', None)
+        cache = getattr(_transport_local, 'transports', None)
+        if cache is None:
+            cache = _transport_local.transports = {}
+        http = cache.get(credentials)
+        if http is None:
+            http = httplib2.Http(timeout=30)
+            if credentials is not None:
+                http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+            cache[credentials] = http
+        return http
+
+    @classmethod
+    def _execute_upload(cls, request, media, http=None):
+        """Run an upload request, adapting chunk size to the link.
+
+        Content that fits in the starting chunk goes through a plain
+        execute() — a single request with no resumable session setup.
+        Larger content is driven chunk by chunk: each timed ack updates
+        the shared bandwidth/failure estimates and the next chunk is
+        re-sized from them, so steady-state throughput approaches the
+        link speed instead of being gated on acknowledgement round
+        trips. Transient 5xx errors back off and re-send only the
+        failing chunk; the resumable session keeps its position.
+        """
+        size = media.size()
+        if size is not None and size <= _UPLOAD_CHUNK_START:
+            return request.execute(http=http)
+
+        chunksize = cls._choose_chunksize()
+        media.set_chunksize(chunksize)
+        response = None
+        attempt = 0
+        while response is None:
+            progress = request.resumable_progress
+            started = time.monotonic()
+            try:
+                _, response = request.next_chunk(http=http)
+            except HttpError as e:
+                if e.resp.status not in _UPLOAD_RETRY_STATUSES:
+                    raise
+                attempt += 1
+                if attempt >= _UPLOAD_MAX_CHUNK_ATTEMPTS:
+                    raise
+                cls._record_chunk(0, 0.0, failed=True)
+                time.sleep(2 ** attempt + random.random())
+            else:
+                attempt = 0
+                # Credit the bytes the session actually advanced — the
+                # final chunk is usually shorter than chunksize, and
+                # crediting the nominal size would overstate the
+                # bandwidth EMA that sizes the next upload's chunks
+                cls._record_chunk(request.resumable_progress - progress,
+                                  time.monotonic() - started, failed=False)
+            new_chunksize = cls._choose_chunksize()
+            if new_chunksize != chunksize:
+                chunksize = new_chunksize
+                media.set_chunksize(chunksize)
+        return response
+
+    def upload(self, file_path: str, folder_id: str = 'root', _http=None) -> str:
         try:
-            if not os.path.exists(file_path):
+            # One stat covers both the existence check and the size
+            # branch; the MIME guess is memoized and passed explicitly
+            # so MediaFileUpload skips its own per-call guess_type walk
+            try:
+                size = os.stat(file_path).st_size
+            except OSError:
                 raise FileOperationError(f"File not found: {file_path}")
-                
+
+            filename = os.path.basename(file_path)
             file_metadata = {
-                'name': os.path.basename(file_path),
+                'name': filename,
                 'parents': [folder_id]
             }
-            
-            media = MediaFileUpload(
-                file_path,
-                resumable=True
+            mimetype = _guess_mimetype(filename)
+
+            if size < _SIMPLE_UPLOAD_MAX:
+                media = MediaFileUpload(file_path, mimetype=mimetype, resumable=False)
+            else:
+                media = _AdaptiveMediaFileUpload(
+                    file_path,
+                    mimetype=mimetype,
+                    chunksize=_UPLOAD_CHUNK_START,
+                    resumable=True
+                )
+
+            request = self._files.create(
+                body=file_metadata,
+                media_body=media,
+                fields='id'
             )
-            
-            file = self.service.files().create(
+            if media.resumable():
+                file = self._execute_upload(request, media, http=_http)
+            else:
+                file = request.execute(http=_http)
+
+            return file.get('id')
+        except FileOperationError:
+            raise
+        except Exception as e:
+            raise FileOperationError(f"Failed to upload file: {str(e)}", envelope=_classify_error(e))
+
+    def upload_many(self, file_paths: List[str], folder_id: str = 'root') -> List[str]:
+        """Upload several local files concurrently.
+
+        Files fan out across a shared worker pool, each upload on its
+        own transport, so a multi-file submission completes in roughly
+        the time of its slowest member instead of the sum of all of
+        them. IDs come back in input order.
+
+        Args:
+            file_paths: Paths of the files to upload
+            folder_id: ID of the destination folder (default: 'root')
+
+        Returns:
+            List[str]: Drive file IDs, one per input path, in order
+
+        Raises:
+            FileOperationError: If any upload fails
+        """
+        if len(file_paths) == 1:
+            return [self.upload(file_paths[0], folder_id)]
+        futures = [
+            _upload_fanout_executor.submit(self._upload_on_worker, path, folder_id)
+            for path in file_paths
+        ]
+        return [future.result() for future in futures]
+
+    def _upload_on_worker(self, file_path: str, folder_id: str) -> str:
+        """Run one fanned-out upload on the worker's own transport."""
+        return self.upload(file_path, folder_id, _http=self._thread_transport())
+
+    def upload_stream(self, stream, filename: str, folder_id: str = 'root',
+                      mimetype: str = None) -> str:
+        try:
+            if hasattr(stream, 'seekable') and stream.seekable():
+                # Werkzeug may have consumed part of the stream while
+                # parsing the multipart body; always upload from byte 0
+                stream.seek(0)
+            else:
+                # Resumable uploads need a seekable stream so failed
+                # chunks can be retried. Spool non-seekable input in
+                # memory, spilling to an anonymous temp file only when
+                # it outgrows the threshold
+                spool = tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024)
+                shutil.copyfileobj(stream, spool)
+                spool.seek(0)
+                stream = spool
+
+            file_metadata = {
+                'name': filename,
+                'parents': [folder_id]
+            }
+
+            stream.seek(0, os.SEEK_END)
+            size = stream.tell()
+            stream.seek(0)
+
+            mimetype = mimetype or _guess_mimetype(filename)
+            if size < _SIMPLE_UPLOAD_MAX:
+                media = MediaIoBaseUpload(
+                    stream,
+                    mimetype=mimetype,
+                    resumable=False
+                )
+            else:
+                media = _AdaptiveMediaIoBaseUpload(
+                    stream,
+                    mimetype=mimetype,
+                    chunksize=_UPLOAD_CHUNK_START,
+                    resumable=True
+                )
+
+            request = self._files.create(
                 body=file_metadata,
                 media_body=media,
                 fields='id'
-            ).execute()
-            
+            )
+            if media.resumable():
+                file = self._execute_upload(request, media)
+            else:
+                file = request.execute()
+
             return file.get('id')
         except Exception as e:
-            raise FileOperationError(f"Failed to upload file: {str(e)}")
-    
-    def download(self, file_id: str) -> io.BytesIO:
+            raise FileOperationError(f"Failed to upload file: {str(e)}", envelope=_classify_error(e))
+
+    def _file_size(self, file_id: str):
+        """Best-effort content length; None when Drive doesn't report one."""
         try:
-            request = self.service.files().get_media(fileId=file_id)
-            content = request.execute()
-            file = io.BytesIO(content)
-            return file
+            meta = self._files.get(
+                fileId=file_id,
+                fields="size"
+            ).execute()
+            return int(meta['size'])
+        except Exception:
+            # Google-native documents carry no size; fall back to the
+            # serial path rather than fail the download
+            return None
+
+    def _fetch_range(self, file_id: str, start: int, end: int) -> bytes:
+        """Fetch one byte range; runs on a ranged-download worker thread."""
+        request = self._files.get_media(fileId=file_id)
+        request.headers['range'] = f'bytes={start}-{end}'
+        return request.execute(http=self._thread_transport())
+
+    def download(self, file_id: str, out_stream=None):
+        size = self._file_size(file_id)
+        if size is not None and size > _RANGED_DOWNLOAD_CHUNK:
+            return self._download_ranged(file_id, size, out_stream)
+
+        # Chunked transfer either way; with an out_stream the content
+        # never accumulates here, it flows straight to the target. The
+        # default spool keeps small files in memory and spills big ones
+        # to disk, so peak RSS is bounded regardless of file size
+        target = out_stream if out_stream is not None else \
+            tempfile.SpooledTemporaryFile(max_size=_DOWNLOAD_SPOOL_MAX)
+        for chunk in self.stream(file_id):
+            target.write(chunk)
+        if out_stream is not None:
+            return out_stream
+        target.seek(0)
+        return target
+
+    def _download_ranged(self, file_id: str, size: int, out_stream):
+        """Download a large file as parallel byte-range requests.
+
+        Ranges are consumed in submission order, so the output is
+        assembled sequentially while later ranges are still arriving on
+        other connections. Only a bounded window is in flight at once
+        and each completed range is dropped as soon as it is written,
+        so memory stays at window * chunk no matter how large the file
+        is.
+        """
+        try:
+            def _submit(start):
+                return _ranged_download_executor.submit(
+                    self._fetch_range, file_id, start,
+                    min(start + _RANGED_DOWNLOAD_CHUNK, size) - 1
+                )
+
+            starts = iter(range(0, size, _RANGED_DOWNLOAD_CHUNK))
+            window = deque(_submit(start)
+                           for start in islice(starts, _RANGED_DOWNLOAD_WINDOW))
+            target = out_stream if out_stream is not None else \
+                tempfile.SpooledTemporaryFile(max_size=_DOWNLOAD_SPOOL_MAX)
+            while window:
+                target.write(window.popleft().result())
+                for start in islice(starts, 1):
+                    window.append(_submit(start))
+            if out_stream is not None:
+                return out_stream
+            target.seek(0)
+            return target
         except Exception as e:
-            raise FileOperationError(f"Failed to download file: {str(e)}")
-    
+            raise FileOperationError(f"Failed to download file: {str(e)}", envelope=_classify_error(e))
+
+    def stream(self, file_id: str, chunk_size: int = 4 * 1024 * 1024):
+        try:
+            request = self._files.get_media(fileId=file_id)
+            # The sink hands back each chunk the downloader writes, so
+            # memory stays bounded at one chunk and nothing is copied
+            # into (and back out of) an intermediate buffer
+            sink = _ChunkSink()
+            downloader = MediaIoBaseDownload(sink, request, chunksize=chunk_size)
+            done = False
+            while not done:
+                _, done = downloader.next_chunk()
+                data = sink.take()
+                if data:
+                    yield data
+        except Exception as e:
+            raise FileOperationError(f"Failed to download file: {str(e)}", envelope=_classify_error(e))
+
     def delete(self, file_id: str) -> None:
         try:
-            self.service.files().delete(fileId=file_id).execute()
+            self._files.delete(fileId=file_id).execute()
         except Exception as e:
-            raise FileOperationError(f"Failed to delete file: {str(e)}")
+            raise FileOperationError(f"Failed to delete file: {str(e)}", envelope=_classify_error(e))
 
 class GoogleDriveFolderOperation(FolderOperation):
     """Concrete implementation of folder operations."""
     
     def __init__(self, service):
         self.service = service
-    
+        self._files = service.files()
+
     def get_name(self, folder_id: str) -> str:
         if folder_id == 'root':
             return "Root"
             
         try:
-            folder = self.service.files().get(
+            folder = self._files.get(
                 fileId=folder_id,
                 fields="name"
             ).execute()
             return folder.get('name', 'Unknown Folder')
         except Exception as e:
-            raise FolderOperationError(f"Failed to get folder name: {str(e)}")
+            raise FolderOperationError(f"Failed to get folder name: {str(e)}", envelope=_classify_error(e))
     
     def get_path(self, folder_id: str) -> List[FolderPath]:
         if folder_id == 'root':
@@ -223,7 +773,7 @@ class GoogleDriveFolderOperation(FolderOperation):
         
         while current_id != 'root':
             try:
-                file = self.service.files().get(
+                file = self._files.get(
                     fileId=current_id,
                     fields="id, name, parents"
                 ).execute()
@@ -239,7 +789,7 @@ class GoogleDriveFolderOperation(FolderOperation):
                 else:
                     break
             except Exception as e:
-                raise FolderOperationError(f"Failed to get folder path: {str(e)}")
+                raise FolderOperationError(f"Failed to get folder path: {str(e)}", envelope=_classify_error(e))
                 
         return path
 
@@ -248,26 +798,36 @@ class GoogleDriveFileMetadata(FileMetadata):
     
     def __init__(self, service):
         self.service = service
-    
+        self._files = service.files()
+
     def get_name(self, file_id: str) -> str:
         try:
-            file = self.service.files().get(
+            file = self._files.get(
                 fileId=file_id,
                 fields="name"
             ).execute()
             return file.get('name', 'Unknown File')
         except Exception as e:
-            raise FileMetadataError(f"Failed to get file name: {str(e)}")
-    
+            raise FileMetadataError(f"Failed to get file name: {str(e)}", envelope=_classify_error(e))
+
+    def get_info(self, file_id: str) -> dict:
+        try:
+            return self._files.get(
+                fileId=file_id,
+                fields="name, size, mimeType"
+            ).execute()
+        except Exception as e:
+            raise FileMetadataError(f"Failed to get file info: {str(e)}", envelope=_classify_error(e))
+
     def get_parent(self, file_id: str) -> str:
         try:
-            file = self.service.files().get(
+            file = self._files.get(
                 fileId=file_id,
                 fields="parents"
             ).execute()
             return file.get('parents', ['root'])[0]
         except Exception as e:
-            raise FileMetadataError(f"Failed to get parent folder: {str(e)}")
+            raise FileMetadataError(f"Failed to get parent folder: {str(e)}", envelope=_classify_error(e))
 
 class GoogleDriveService:
     """Service class that coordinates different Google Drive operations.
@@ -275,6 +835,10 @@ class GoogleDriveService:
     implementing a facade pattern to simplify the interaction with different
     components (file operations, folder operations, and metadata operations).
     """
+
+    # How long the bulk folder index stays valid before being rebuilt,
+    # so renames/moves made outside this app eventually show up
+    FOLDER_INDEX_TTL = 300  # seconds
     
     def __init__(self, service):
         """Initialize the service with Google Drive API service object.
@@ -286,54 +850,251 @@ class GoogleDriveService:
         self.folder_operation = GoogleDriveFolderOperation(service)
         self.file_metadata = GoogleDriveFileMetadata(service)
         self.service = service
+        # Resolved once: files()/changes() re-walk the discovery
+        # document to rebuild the resource collection on every call
+        self._files = service.files()
+        self._changes = service.changes()
+        # Lazily built {folder_id: (name, parent_id)} map used to resolve
+        # breadcrumb paths without a network call per ancestor
+        self._folder_index = None
+        self._folder_index_built_at = 0.0
+        # Names and parents change rarely relative to how often the UI
+        # asks for them, so cache lookups for a few minutes. Service
+        # instances are per-session, so entries cannot leak across users
+        self._meta_cache = TTLCache(maxsize=4096, ttl=300)
+        self._meta_lock = threading.Lock()
+        # Short-lived cache of dashboard bundles keyed by folder. Back-
+        # button revisits and quick navigation loops re-render the same
+        # folder within seconds; a brief TTL serves those from memory.
+        # Mutations through this service invalidate immediately, and
+        # each entry carries the changes token it was built under so an
+        # external change (which advances the token) busts it too
+        self._list_cache = TTLCache(maxsize=256, ttl=30)
+        self._list_lock = threading.Lock()
     
-    def list_files(self, folder_id: str = 'root', page_size: int = 50) -> List[FileInfo]:
-        """List files and folders in a directory with pagination support.
-        
-        This method queries the Google Drive API with specific parameters to:
-        1. Filter files by parent folder
-        2. Exclude trashed items
-        3. Sort results by folder first, then by name
-        4. Convert timestamps to local datetime format
-        
+    def fetch_dashboard_bundle(self, folder_id: str = 'root', page_size: int = 1000,
+                               changes_token: str = None):
+        """Fetch everything the dashboard needs in a single batch round trip.
+
+        The dashboard requires the current folder's name, its breadcrumb
+        path, and the folder listing. Issuing those as separate HTTPS
+        requests pays one network round trip each; Drive's batch endpoint
+        packs the folder metadata lookup and the listing into a single
+        multipart/mixed transaction instead. The breadcrumb walk is
+        resolved afterwards (it is sequential by nature, one parent per
+        level) and reuses the parent returned by the batched get.
+
         Args:
-            folder_id: ID of the folder to list (default: 'root')
-            page_size: Number of items to retrieve per page (default: 50)
-            
+            folder_id: ID of the folder to display (default: 'root')
+            page_size: Number of items per listing page (default/max: 1000)
+            changes_token: The drive's current changes token, if the
+                caller has it. A cached bundle built under a different
+                token is discarded: the caller is about to stamp the
+                response with the current token, and serving older data
+                under it would pin the staleness until the next drive
+                change.
+
         Returns:
-            List[FileInfo]: List of file/folder information objects
-            
+            tuple: (folder_name: str, path: List[FolderPath], files: List[FileInfo])
+
         Raises:
-            GoogleDriveError: If the API request fails or returns invalid data
+            GoogleDriveError: If the batch request fails
         """
+        cache_key = (folder_id, page_size)
+        with self._list_lock:
+            cached = self._list_cache.get(cache_key)
+        if cached is not None:
+            cached_token, bundle = cached
+            if changes_token is None or cached_token == changes_token:
+                return bundle
+
         try:
-            query = f"'{folder_id}' in parents and trashed = false"
-            results = self.service.files().list(
+            responses = {}
+            errors = {}
+
+            def _collect(request_id, response, exception):
+                if exception is not None:
+                    errors[request_id] = exception
+                else:
+                    responses[request_id] = response
+
+            query = _PARENT_QUERY % folder_id
+            batch = self.service.new_batch_http_request(callback=_collect)
+            batch.add(self._files.list(
                 q=query,
                 pageSize=page_size,
-                fields="nextPageToken, files(id, name, mimeType, modifiedTime)",
+                fields=_LISTING_FIELDS,
                 orderBy="folder,name"
-            ).execute()
-            
-            files = results.get('files', [])
-            file_list = []
-            
-            for file in files:
-                modified_time = datetime.fromisoformat(file['modifiedTime'].replace('Z', '+00:00'))
-                is_folder = file['mimeType'] == 'application/vnd.google-apps.folder'
-                
-                file_info = FileInfo(
-                    id=file['id'],
-                    name=file['name'],
-                    type=file['mimeType'],
-                    modified=modified_time.strftime('%Y-%m-%d %H:%M:%S'),
-                    is_folder=is_folder
-                )
-                file_list.append(file_info)
-                
-            return file_list
+            ), request_id='listing')
+            if folder_id != 'root':
+                batch.add(self._files.get(
+                    fileId=folder_id,
+                    fields="id, name, parents"
+                ), request_id='folder')
+            batch.execute()
+
+            if errors:
+                raise next(iter(errors.values()))
+
+            if folder_id == 'root':
+                folder_name = "Root"
+                path = []
+            else:
+                folder = responses['folder']
+                folder_name = folder.get('name', 'Unknown Folder')
+                # The batched get already carries this folder's name and
+                # parent; merge it into the folder index so the breadcrumb
+                # walk below never falls back to a remote per-ancestor
+                # lookup for a folder created after the index snapshot
+                if self._folder_index is not None:
+                    parents = folder.get('parents', [])
+                    self._folder_index[folder['id']] = (
+                        folder_name, parents[0] if parents else None
+                    )
+                path = self.get_folder_path(folder_id)
+
+            listing = responses['listing']
+            files = [self._build_file_info(file)
+                     for file in listing.get('files', [])]
+            # Folders larger than one page are rare but must not be
+            # silently truncated; follow nextPageToken for the remainder
+            page_token = listing.get('nextPageToken')
+            while page_token:
+                listing = self._files.list(
+                    q=query,
+                    pageSize=page_size,
+                    fields=_LISTING_FIELDS,
+                    orderBy="folder,name",
+                    pageToken=page_token
+                ).execute()
+                files.extend(self._build_file_info(file)
+                             for file in listing.get('files', []))
+                page_token = listing.get('nextPageToken')
+            self._prime_meta_from_listing(files, folder_id)
+            bundle = (folder_name, path, files)
+            with self._list_lock:
+                self._list_cache[cache_key] = (changes_token, bundle)
+            return bundle
+        except GoogleDriveError:
+            raise
+        except Exception as e:
+            raise GoogleDriveError(f"Failed to fetch dashboard data: {str(e)}", envelope=_classify_error(e))
+
+    @staticmethod
+    def _build_file_info(file) -> FileInfo:
+        """Convert a raw Drive file resource into a FileInfo object.
+
+        The modifiedTime string is passed through unparsed: formatting
+        it here would cost a datetime parse per row for a value that is
+        only ever displayed, and only for the rows a template actually
+        renders. The `drive_time` Jinja filter formats it lazily.
+        """
+        mime_type = file['mimeType']
+        parents = file.get('parents')
+
+        return FileInfo(
+            id=file['id'],
+            name=file['name'],
+            type=mime_type,
+            modified=file['modifiedTime'],
+            is_folder=mime_type == _FOLDER_MIME,
+            parent=parents[0] if parents else None,
+            size=file.get('size')
+        )
+
+    def _prime_meta_from_listing(self, files: List[FileInfo], folder_id: str) -> None:
+        """Seed the metadata cache from listing rows.
+
+        A listing already carries each child's name, type, size and
+        parent, so follow-up get_file_name / get_file_parent /
+        get_file_info calls for listed IDs should never cost another
+        files().get round trip.
+        """
+        with self._meta_lock:
+            for info in files:
+                self._meta_cache[('name', info.id)] = info.name
+                self._meta_cache[('parent', info.id)] = info.parent or folder_id
+                if info.is_folder:
+                    self._meta_cache[('folder_name', info.id)] = info.name
+                else:
+                    file_info = {'name': info.name, 'mimeType': info.type}
+                    if info.size is not None:
+                        file_info['size'] = info.size
+                    self._meta_cache[('info', info.id)] = file_info
+
+    def _fetch_page(self, query: str, page_size: int, page_token):
+        """Fetch one listing page; runs on the prefetch thread."""
+        return self._files.list(
+            q=query,
+            pageSize=page_size,
+            fields=_LISTING_FIELDS,
+            orderBy="folder,name",
+            pageToken=page_token
+        ).execute()
+
+    def iter_files(self, folder_id: str = 'root', page_size: int = 1000) -> Iterator[FileInfo]:
+        """Iterate over all files and folders in a directory.
+
+        Follows nextPageToken across pages, requesting up to the API
+        maximum of 1000 items per call so a large folder costs as few
+        round trips as possible. While the consumer processes one page,
+        the next page's request is already in flight on a prefetch
+        thread, overlapping the network round trip with row conversion.
+        Being a generator, a consumer that only needs the first page
+        never triggers the follow-up requests.
+
+        Args:
+            folder_id: ID of the folder to list (default: 'root')
+            page_size: Number of items per API page (default/max: 1000)
+
+        Yields:
+            FileInfo: File/folder information objects in folder,name order
+
+        Raises:
+            GoogleDriveError: If the API request fails or returns invalid data
+        """
+        try:
+            query = _PARENT_QUERY % folder_id
+            build_file_info = self._build_file_info
+            future = _page_prefetch_executor.submit(
+                self._fetch_page, query, page_size, None
+            )
+            while True:
+                results = future.result()
+                page_token = results.get('nextPageToken')
+                if page_token:
+                    future = _page_prefetch_executor.submit(
+                        self._fetch_page, query, page_size, page_token
+                    )
+
+                page = [build_file_info(file) for file in results.get('files', [])]
+                self._prime_meta_from_listing(page, folder_id)
+                yield from page
+
+                if not page_token:
+                    break
+        except GoogleDriveError:
+            raise
         except Exception as e:
-            raise GoogleDriveError(f"Failed to list files: {str(e)}")
+            raise GoogleDriveError(f"Failed to list files: {str(e)}", envelope=_classify_error(e))
+
+    def list_files(self, folder_id: str = 'root', page_size: int = 50) -> List[FileInfo]:
+        """List files and folders in a directory.
+
+        Thin wrapper over iter_files that materializes at most page_size
+        entries, kept for callers that want a plain list.
+
+        Args:
+            folder_id: ID of the folder to list (default: 'root')
+            page_size: Maximum number of items to return (default: 50)
+
+        Returns:
+            List[FileInfo]: List of file/folder information objects
+
+        Raises:
+            GoogleDriveError: If the API request fails or returns invalid data
+        """
+        return list(islice(self.iter_files(folder_id, page_size), page_size))
     
     def get_folder_name(self, folder_id: str) -> str:
         """Get the name of a folder by its ID.
@@ -345,22 +1106,218 @@ class GoogleDriveService:
         Returns:
             str: The name of the folder
         """
-        return self.folder_operation.get_name(folder_id)
+        cache_key = ('folder_name', folder_id)
+        with self._meta_lock:
+            if cache_key in self._meta_cache:
+                return self._meta_cache[cache_key]
+        name = self.folder_operation.get_name(folder_id)
+        with self._meta_lock:
+            self._meta_cache[cache_key] = name
+        return name
     
+    def _get_folder_index(self) -> dict:
+        """Build (or return) a map of all folders to their name and parent.
+
+        Walking the parent chain with one files().get per ancestor costs
+        depth-N round trips on every breadcrumb render. Instead, fetch
+        every folder the user owns in one (paginated) files().list call
+        and resolve paths with an in-memory walk, so the cost is a single
+        request regardless of folder depth.
+
+        Returns:
+            dict: {folder_id: (name, parent_id or None)}
+
+        Raises:
+            FolderOperationError: If the folder listing fails
+        """
+        expired = (time.monotonic() - self._folder_index_built_at) > self.FOLDER_INDEX_TTL
+        if self._folder_index is None or expired:
+            try:
+                index = {}
+                page_token = None
+                while True:
+                    results = self._files.list(
+                        q=_FOLDER_QUERY,
+                        pageSize=1000,
+                        fields="nextPageToken, files(id, name, parents)",
+                        pageToken=page_token
+                    ).execute()
+                    for folder in results.get('files', []):
+                        parents = folder.get('parents', [])
+                        index[folder['id']] = (folder['name'], parents[0] if parents else None)
+                    page_token = results.get('nextPageToken')
+                    if not page_token:
+                        break
+                self._folder_index = index
+                self._folder_index_built_at = time.monotonic()
+            except Exception as e:
+                raise FolderOperationError(f"Failed to index folders: {str(e)}", envelope=_classify_error(e))
+        return self._folder_index
+
+    def _invalidate_listing(self, folder_id=None) -> None:
+        """Drop cached listings after a mutation.
+
+        With a known folder only that folder's bundles go; without one
+        (e.g. a delete whose parent was never cached) everything goes —
+        correctness over the 30-second convenience window.
+        """
+        with self._list_lock:
+            if folder_id is None:
+                self._list_cache.clear()
+                return
+            for key in [k for k in self._list_cache if k[0] == folder_id]:
+                self._list_cache.pop(key, None)
+
+    def _invalidate_folder_index(self) -> None:
+        """Drop the cached folder index after a mutation that may change it."""
+        self._folder_index = None
+
+    @staticmethod
+    def _adopt_remote_path(index, path) -> None:
+        """Merge a remotely walked breadcrumb chain into the folder index.
+
+        Each entry's parent is the entry before it, so the next render
+        of this path (or any path through these ancestors) resolves
+        in memory instead of repeating the per-ancestor walk. The top
+        entry gets a None parent, which ends the in-memory walk exactly
+        where the remote walk ended.
+        """
+        parent_id = None
+        for entry in path:
+            index[entry.id] = (entry.name, parent_id)
+            parent_id = entry.id
+
     def get_folder_path(self, folder_id: str) -> List[FolderPath]:
-        return self.folder_operation.get_path(folder_id)
+        if folder_id == 'root':
+            return []
+
+        try:
+            index = self._get_folder_index()
+        except FolderOperationError:
+            # Fall back to the per-ancestor walk if bulk indexing fails
+            return self.folder_operation.get_path(folder_id)
+
+        if folder_id not in index:
+            # Probably a folder created after the index snapshot: one
+            # targeted get merges it in and the walk stays in memory.
+            # If its parent is unknown too (a shared folder with a chain
+            # of foreign ancestors), fall back to the remote walk so the
+            # breadcrumb is complete rather than truncated
+            try:
+                folder = self._files.get(
+                    fileId=folder_id,
+                    fields="id, name, parents"
+                ).execute()
+                parents = folder.get('parents', [])
+                parent_id = parents[0] if parents else None
+                if parent_id is not None and parent_id not in index:
+                    path = self.folder_operation.get_path(folder_id)
+                    self._adopt_remote_path(index, path)
+                    return path
+                index[folder_id] = (folder.get('name', 'Unknown Folder'), parent_id)
+            except Exception:
+                return self.folder_operation.get_path(folder_id)
+
+        path = []
+        current_id = folder_id
+        # Bounded walk guards against parent cycles in a corrupt index
+        for _ in range(len(index) + 1):
+            entry = index.get(current_id)
+            if entry is None:
+                break
+            name, parent_id = entry
+            path.insert(0, FolderPath(id=current_id, name=name))
+            if parent_id is None or parent_id not in index:
+                break
+            current_id = parent_id
+        return path
     
     def upload_file(self, file_path: str, folder_id: str = 'root') -> str:
-        return self.file_operation.upload(file_path, folder_id)
+        file_id = self.file_operation.upload(file_path, folder_id)
+        self._invalidate_listing(folder_id)
+        return file_id
+
+    def upload_files(self, file_paths: List[str], folder_id: str = 'root') -> List[str]:
+        file_ids = self.file_operation.upload_many(file_paths, folder_id)
+        self._invalidate_listing(folder_id)
+        return file_ids
+
+    def upload_file_stream(self, stream, filename: str, folder_id: str = 'root',
+                           mimetype: str = None) -> str:
+        file_id = self.file_operation.upload_stream(stream, filename, folder_id, mimetype)
+        self._invalidate_listing(folder_id)
+        return file_id
     
-    def download_file(self, file_id: str) -> io.BytesIO:
-        return self.file_operation.download(file_id)
+    def download_file(self, file_id: str, out_stream=None):
+        return self.file_operation.download(file_id, out_stream)
+
+    def stream_file(self, file_id: str, chunk_size: int = 4 * 1024 * 1024):
+        return self.file_operation.stream(file_id, chunk_size)
     
     def get_file_name(self, file_id: str) -> str:
-        return self.file_metadata.get_name(file_id)
+        cache_key = ('name', file_id)
+        with self._meta_lock:
+            if cache_key in self._meta_cache:
+                return self._meta_cache[cache_key]
+        name = self.file_metadata.get_name(file_id)
+        with self._meta_lock:
+            self._meta_cache[cache_key] = name
+        return name
+
+    def get_file_info(self, file_id: str) -> dict:
+        cache_key = ('info', file_id)
+        with self._meta_lock:
+            if cache_key in self._meta_cache:
+                return self._meta_cache[cache_key]
+        info = self.file_metadata.get_info(file_id)
+        with self._meta_lock:
+            self._meta_cache[cache_key] = info
+        return info
     
     def get_file_parent(self, file_id: str) -> str:
-        return self.file_metadata.get_parent(file_id)
-    
+        cache_key = ('parent', file_id)
+        with self._meta_lock:
+            if cache_key in self._meta_cache:
+                return self._meta_cache[cache_key]
+        parent = self.file_metadata.get_parent(file_id)
+        with self._meta_lock:
+            self._meta_cache[cache_key] = parent
+        return parent
+
+    def get_changes_token(self) -> str:
+        """Get Drive's current change-log position for the whole drive.
+
+        The token advances whenever anything in the drive changes, which
+        makes it a cheap freshness check: an unchanged token means a
+        previously rendered listing is still valid.
+
+        Returns:
+            str: Opaque startPageToken value
+
+        Raises:
+            GoogleDriveError: If the request fails
+        """
+        try:
+            response = self._changes.getStartPageToken().execute()
+            return response['startPageToken']
+        except Exception as e:
+            raise GoogleDriveError(f"Failed to get changes token: {str(e)}", envelope=_classify_error(e))
+
+    def _invalidate_meta(self, file_id: str) -> None:
+        """Drop cached metadata for a file after it is mutated."""
+        with self._meta_lock:
+            self._meta_cache.pop(('folder_name', file_id), None)
+            self._meta_cache.pop(('name', file_id), None)
+            self._meta_cache.pop(('parent', file_id), None)
+            self._meta_cache.pop(('info', file_id), None)
+
     def delete_file(self, file_id: str) -> None:
-        self.file_operation.delete(file_id)
\ No newline at end of file
+        # The parent is only consulted from the cache: paying a lookup
+        # round trip just to scope the listing invalidation would cost
+        # more than over-invalidating
+        with self._meta_lock:
+            parent_id = self._meta_cache.get(('parent', file_id))
+        self.file_operation.delete(file_id)
+        self._invalidate_meta(file_id)
+        self._invalidate_folder_index()
+        self._invalidate_listing(parent_id)
\ No newline at end of file
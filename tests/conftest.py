@@ -0,0 +1,97 @@
+"""Shared pytest fixtures for the test suite.
+
+The Flask app is configured once per session: importing and wiring the
+application is the dominant fixed cost of the integration tests, so
+rebuilding it per test would pay that price seven times over. Each test
+still gets its own client — and with it a clean session cookie.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app import app
+from services.google_drive_service import GoogleDriveService
+
+# One spec-bound mock shared by every test: spec resolves the attribute
+# set once (and makes a typo'd method an immediate AttributeError
+# instead of a silently passing child mock); the fixture fully resets
+# it per test so no configuration leaks between tests
+_DRIVE_SERVICE_MOCK = MagicMock(spec=GoogleDriveService)
+
+
+@pytest.fixture(scope='session')
+def flask_app():
+    """The application, configured for testing once for the whole run.
+
+    This is the only place allowed to mutate app.config: keeping the
+    mutation session-scoped means no test needs subprocess isolation.
+    A future test that must change config mid-run should carry
+    @pytest.mark.forked (pytest-forked) rather than widening this
+    fixture.
+    """
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    return app
+
+
+@pytest.fixture
+def client(flask_app):
+    """A fresh test client (and thus a clean session) per test."""
+    with flask_app.test_client() as client:
+        yield client
+
+
+# One complete OAuth token for every test that needs an authenticated
+# session; fixtures copy it so a test mutating its session cannot leak
+# into the next
+TEST_TOKEN = {
+    'token': 'test_token',
+    'refresh_token': 'test_refresh_token',
+    'token_uri': 'test_uri',
+    'client_id': 'test_client_id',
+    'client_secret': 'test_client_secret',
+    'scopes': ['test_scope'],
+    'expiry': None
+}
+
+
+# Signed session cookies, computed on first use. session_transaction()
+# would re-run the itsdangerous HMAC signing for every test; the
+# payloads never change, so one signed value serves them all
+_signed_token_cookie = None
+_signed_state_cookie = None
+
+
+@pytest.fixture
+def authed_client(client):
+    """Client whose session already carries a complete OAuth token."""
+    global _signed_token_cookie
+    if _signed_token_cookie is None:
+        serializer = app.session_interface.get_signing_serializer(app)
+        _signed_token_cookie = serializer.dumps({'token': dict(TEST_TOKEN)})
+    client.set_cookie(app.config['SESSION_COOKIE_NAME'], _signed_token_cookie)
+    return client
+
+
+@pytest.fixture
+def drive_service(monkeypatch):
+    """Mock Drive service installed behind app.get_google_drive_service.
+
+    Tests configure return values directly on the mock instead of each
+    carrying its own @patch decorator for the same target.
+    """
+    _DRIVE_SERVICE_MOCK.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr('app.get_google_drive_service',
+                        lambda: _DRIVE_SERVICE_MOCK)
+    return _DRIVE_SERVICE_MOCK
+
+
+@pytest.fixture
+def state_client(client):
+    """Client mid-OAuth-flow, with the CSRF state set in its session."""
+    global _signed_state_cookie
+    if _signed_state_cookie is None:
+        serializer = app.session_interface.get_signing_serializer(app)
+        _signed_state_cookie = serializer.dumps({'state': 'test_state'})
+    client.set_cookie(app.config['SESSION_COOKIE_NAME'], _signed_state_cookie)
+    return client
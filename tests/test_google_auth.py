@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import Mock
+
+from services.google_auth import GoogleAuth, _client_config
+
+class _FakeConfig:
+    """Minimal config stand-in so tests never touch credentials.json."""
+    GOOGLE_CLIENT_ID = 'test-client.apps.googleusercontent.com'
+    GOOGLE_CLIENT_SECRET = 'test-secret'
+    GOOGLE_REDIRECT_URI = 'http://localhost/oauth2callback'
+    GOOGLE_DRIVE_SCOPES = ['https://www.googleapis.com/auth/drive']
+
+class TestGoogleAuth(unittest.TestCase):
+    """Test suite for the OAuth helper.
+
+    Focuses on the pieces that must work without any network access:
+    service construction from the bundled discovery document and
+    client-config memoization.
+    """
+
+    def setUp(self):
+        self.auth = GoogleAuth(_FakeConfig)
+
+    def test_get_drive_service_builds_offline(self):
+        """Test that building a service needs no discovery fetch.
+
+        The service comes from the static discovery document bundled
+        with the client library, so construction must succeed with no
+        network available and expose the files() resource.
+        """
+        credentials = Mock()
+        service = self.auth.get_drive_service(credentials)
+        self.assertTrue(hasattr(service, 'files'))
+
+    def test_client_config_is_shared(self):
+        """Test that identical credential sets share one config dict."""
+        other = GoogleAuth(_FakeConfig)
+        self.assertIs(self.auth.client_config, other.client_config)
+        self.assertEqual(
+            self.auth.client_config['web']['client_id'],
+            _FakeConfig.GOOGLE_CLIENT_ID
+        )
+
+    def test_save_credentials_atomic(self):
+        """Test that token persistence writes the file in place.
+
+        Verifies the destination holds the full token dict and no .tmp
+        sibling is left behind.
+        """
+        import json
+        import os
+        import tempfile
+
+        token = {'token': 'abc', 'refresh_token': 'def'}
+        path = os.path.join(tempfile.mkdtemp(), 'token.json')
+        try:
+            self.auth.save_credentials(path, token)
+            with open(path) as f:
+                self.assertEqual(json.load(f), token)
+            self.assertFalse(os.path.exists(f'{path}.tmp'))
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+            os.rmdir(os.path.dirname(path))
+
+    def test_orjson_response_model_decodes(self):
+        """Test the orjson-backed response model when the accelerator is
+        installed.
+
+        The model must decode raw response bytes to plain dicts, since
+        it replaces the stdlib parser for every Drive response.
+        """
+        from services.google_auth import _RESPONSE_MODEL
+        if _RESPONSE_MODEL is None:
+            self.skipTest('orjson not installed')
+        body = _RESPONSE_MODEL.deserialize(b'{"files": [{"id": "file1"}]}')
+        self.assertEqual(body['files'][0]['id'], 'file1')
+
+    def test_client_config_contents(self):
+        config = _client_config('id', 'secret', 'http://localhost/cb')
+        self.assertEqual(config['web']['client_secret'], 'secret')
+        self.assertEqual(config['web']['redirect_uri'], 'http://localhost/cb')
+
+if __name__ == '__main__':
+    unittest.main()
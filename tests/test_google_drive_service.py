@@ -1,6 +1,5 @@
 import unittest
 from unittest.mock import Mock, patch
-from datetime import datetime
 import io
 import os
 from services.google_drive_service import (
@@ -9,11 +8,7 @@ from services.google_drive_service import (
     GoogleDriveFolderOperation,
     GoogleDriveFileMetadata,
     FileInfo,
-    FolderPath,
-    GoogleDriveError,
-    FileOperationError,
-    FolderOperationError,
-    FileMetadataError
+    FileOperationError
 )
 
 class TestGoogleDriveFileOperation(unittest.TestCase):
@@ -58,6 +53,46 @@ class TestGoogleDriveFileOperation(unittest.TestCase):
             if os.path.exists(test_file_path):
                 os.remove(test_file_path)
                 
+    def test_upload_stream_success(self):
+        """Test successful streaming upload from a file-like object.
+
+        Verifies the stream path never requires a local file and
+        returns the new file's ID.
+        """
+        mock_response = {'id': 'test_file_id'}
+        self.mock_service.files().create().execute.return_value = mock_response
+
+        stream = io.BytesIO(b'test content')
+        result = self.file_operation.upload_stream(stream, 'test.txt', mimetype='text/plain')
+        self.assertEqual(result, 'test_file_id')
+        self.mock_service.files().create.assert_called()
+
+    def test_upload_many_returns_ids_in_order(self):
+        """Test the concurrent multi-file upload path.
+
+        Each path must produce one upload on its own transport, with
+        IDs returned in input order.
+        """
+        paths = []
+        try:
+            for i in range(3):
+                path = f'test_upload_{i}.txt'
+                with open(path, 'w') as f:
+                    f.write('test content')
+                paths.append(path)
+
+            with patch.object(self.file_operation, 'upload',
+                              side_effect=lambda p, folder_id, _http=None: f'id_{p}') \
+                    as mock_upload:
+                result = self.file_operation.upload_many(paths, 'folder_id')
+
+            self.assertEqual(result, [f'id_{p}' for p in paths])
+            self.assertEqual(mock_upload.call_count, 3)
+        finally:
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
     def test_upload_file_not_found(self):
         """Test upload with non-existent file.
         
@@ -67,24 +102,191 @@ class TestGoogleDriveFileOperation(unittest.TestCase):
         with self.assertRaises(FileOperationError):
             self.file_operation.upload('nonexistent_file.txt')
             
+    def test_upload_retries_transient_chunk_errors(self):
+        """Test that a 503 during a chunk is retried, not fatal.
+
+        The resumable session survives the error, so only the failing
+        chunk is re-sent and the upload still completes.
+        """
+        from googleapiclient.errors import HttpError
+
+        media = Mock()
+        media.size.return_value = 100 * 1024 * 1024
+        request = Mock()
+        request.resumable_progress = 0
+        error = HttpError(Mock(status=503), b'backend error')
+        request.next_chunk.side_effect = [error, (None, {'id': 'test_file_id'})]
+
+        with patch('services.google_drive_service.time.sleep'):
+            response = GoogleDriveFileOperation._execute_upload(request, media)
+
+        self.assertEqual(response['id'], 'test_file_id')
+        self.assertEqual(request.next_chunk.call_count, 2)
+
+    def test_upload_records_actual_chunk_bytes(self):
+        """Test that the bandwidth EMA credits real session progress.
+
+        The final chunk is usually shorter than the configured
+        chunksize; crediting the nominal size would overstate the link
+        estimate that sizes the next upload's chunks.
+        """
+        media = Mock()
+        media.size.return_value = 100 * 1024 * 1024
+        request = Mock()
+        request.resumable_progress = 0
+
+        def next_chunk(http=None):
+            request.resumable_progress += 1024 * 1024
+            return (None, {'id': 'test_file_id'})
+
+        request.next_chunk.side_effect = next_chunk
+
+        cls = GoogleDriveFileOperation
+        recorded = []
+        with patch.object(cls, '_record_chunk',
+                          side_effect=lambda nbytes, elapsed, failed:
+                          recorded.append(nbytes)):
+            cls._execute_upload(request, media)
+
+        self.assertEqual(recorded, [1024 * 1024])
+
+    def test_chunksize_tracks_link_estimates(self):
+        """Test the EMA-driven chunk-size chooser.
+
+        A clean 4 MB/s link with a 4 s target yields 16 MB chunks; the
+        same link at full failure rate shrinks the chunk, rounded to
+        Drive's 256 KiB granule; extreme estimates stay clamped.
+        """
+        cls = GoogleDriveFileOperation
+        with patch.object(cls, '_ema_bandwidth', 4 * 1024 * 1024), \
+             patch.object(cls, '_ema_failure', 0.0):
+            self.assertEqual(cls._choose_chunksize(), 16 * 1024 * 1024)
+        with patch.object(cls, '_ema_bandwidth', 4 * 1024 * 1024), \
+             patch.object(cls, '_ema_failure', 1.0):
+            chunk = cls._choose_chunksize()
+            self.assertEqual(chunk % (256 * 1024), 0)
+            self.assertLess(chunk, 4 * 1024 * 1024)
+        with patch.object(cls, '_ema_bandwidth', 10 ** 12), \
+             patch.object(cls, '_ema_failure', 0.0):
+            self.assertEqual(cls._choose_chunksize(), 32 * 1024 * 1024)
+        with patch.object(cls, '_ema_bandwidth', 1024), \
+             patch.object(cls, '_ema_failure', 0.0):
+            self.assertEqual(cls._choose_chunksize(), 1024 * 1024)
+
     def test_download_success(self):
-        # Mock the file content
-        mock_content = b'test content'
-        
-        # Mock the get_media method to return a request object
-        mock_request = Mock()
-        mock_request.execute.return_value = mock_content
-        self.mock_service.files().get_media.return_value = mock_request
-        
-        result = self.file_operation.download('test_file_id')
-        self.assertIsInstance(result, io.BytesIO)
-        self.assertEqual(result.getvalue(), mock_content)
+        # Mock the file content arriving in chunks
+        chunks = [b'test ', b'content']
+
+        def make_downloader(buffer, request, chunksize):
+            downloader = Mock()
+            state = {'index': 0}
+
+            def next_chunk():
+                buffer.write(chunks[state['index']])
+                state['index'] += 1
+                return None, state['index'] == len(chunks)
+
+            downloader.next_chunk.side_effect = next_chunk
+            return downloader
+
+        with patch('services.google_drive_service.MediaIoBaseDownload',
+                   side_effect=make_downloader):
+            result = self.file_operation.download('test_file_id')
+
+        # Returned file-like is positioned at byte 0, ready to read
+        self.assertEqual(result.read(), b'test content')
         self.mock_service.files().get_media.assert_called_once_with(fileId='test_file_id')
+
+    def test_download_to_out_stream(self):
+        """Test download into a caller-provided stream.
+
+        Verifies content is written to the target instead of an
+        intermediate BytesIO, so large files never accumulate in memory.
+        """
+        def make_downloader(buffer, request, chunksize):
+            downloader = Mock()
+            downloader.next_chunk.side_effect = lambda: (
+                buffer.write(b'test content'), True
+            )
+            return downloader
+
+        target = io.BytesIO()
+        with patch('services.google_drive_service.MediaIoBaseDownload',
+                   side_effect=make_downloader):
+            result = self.file_operation.download('test_file_id', out_stream=target)
+
+        self.assertIs(result, target)
+        self.assertEqual(target.getvalue(), b'test content')
         
+    def test_download_ranged_for_large_files(self):
+        """Test that large files download as parallel byte ranges.
+
+        A 64 MB + 1 byte file splits into three ranges; the assembled
+        content must preserve range order.
+        """
+        size = 64 * 1024 * 1024 + 1
+        self.mock_service.files().get().execute.return_value = {'size': str(size)}
+
+        with patch.object(self.file_operation, '_fetch_range',
+                          side_effect=[b'first', b'second', b'third']) as mock_fetch:
+            result = self.file_operation.download('test_file_id')
+
+        self.assertEqual(result.read(), b'firstsecondthird')
+        self.assertEqual(mock_fetch.call_count, 3)
+
+    def test_stream_success(self):
+        """Test chunked streaming download.
+
+        Verifies chunks are yielded in order and the reusable buffer
+        is drained between chunks.
+        """
+        chunks = [b'first chunk', b'second chunk']
+
+        def make_downloader(buffer, request, chunksize):
+            downloader = Mock()
+            state = {'index': 0}
+
+            def next_chunk():
+                buffer.write(chunks[state['index']])
+                state['index'] += 1
+                return None, state['index'] == len(chunks)
+
+            downloader.next_chunk.side_effect = next_chunk
+            return downloader
+
+        with patch('services.google_drive_service.MediaIoBaseDownload',
+                   side_effect=make_downloader):
+            result = list(self.file_operation.stream('test_file_id'))
+
+        self.assertEqual(result, chunks)
+        self.mock_service.files().get_media.assert_called_once_with(fileId='test_file_id')
+
     def test_delete_success(self):
         self.file_operation.delete('test_file_id')
         self.mock_service.files().delete.assert_called_once_with(fileId='test_file_id')
 
+    def test_error_envelope_classifies_status(self):
+        """Test that wrapped errors carry a typed envelope.
+
+        A 404 must classify as non-retryable not_found; a 503 as a
+        retryable network failure.
+        """
+        from googleapiclient.errors import HttpError
+
+        self.mock_service.files().delete().execute.side_effect = \
+            HttpError(Mock(status=404), b'not found')
+        with self.assertRaises(FileOperationError) as ctx:
+            self.file_operation.delete('test_file_id')
+        self.assertEqual(ctx.exception.envelope.reason_hint, 'not_found')
+        self.assertFalse(ctx.exception.envelope.retryable)
+
+        self.mock_service.files().delete().execute.side_effect = \
+            HttpError(Mock(status=503), b'backend error')
+        with self.assertRaises(FileOperationError) as ctx:
+            self.file_operation.delete('test_file_id')
+        self.assertEqual(ctx.exception.envelope.reason_hint, 'network')
+        self.assertTrue(ctx.exception.envelope.retryable)
+
 class TestGoogleDriveFolderOperation(unittest.TestCase):
     """Test suite for Google Drive folder operations.
     
@@ -144,6 +346,14 @@ class TestGoogleDriveFileMetadata(unittest.TestCase):
         result = self.file_metadata.get_name('test_file_id')
         self.assertEqual(result, 'test_file.txt')
         
+    def test_get_info_success(self):
+        mock_response = {'name': 'test_file.txt', 'size': '12', 'mimeType': 'text/plain'}
+        self.mock_service.files().get().execute.return_value = mock_response
+
+        result = self.file_metadata.get_info('test_file_id')
+        self.assertEqual(result['name'], 'test_file.txt')
+        self.assertEqual(result['size'], '12')
+
     def test_get_parent_success(self):
         mock_response = {'parents': ['parent_folder_id']}
         self.mock_service.files().get().execute.return_value = mock_response
@@ -180,6 +390,148 @@ class TestGoogleDriveService(unittest.TestCase):
         self.assertIsInstance(result[0], FileInfo)
         self.assertTrue(result[1].is_folder)
         
+    def test_list_files_minimal_projection(self):
+        """Test that listings request only the fields the UI consumes.
+
+        A wider projection would inflate every response payload, so the
+        exact fields string is pinned here.
+        """
+        self.mock_service.files().list().execute.return_value = {'files': []}
+
+        self.drive_service.list_files()
+        _, kwargs = self.mock_service.files().list.call_args
+        self.assertEqual(
+            kwargs['fields'],
+            "nextPageToken, files(id, name, mimeType, modifiedTime, parents, size)"
+        )
+        self.assertEqual(kwargs['orderBy'], "folder,name")
+
+    def test_iter_files_follows_pages(self):
+        """Test that the iterator yields across nextPageToken boundaries.
+
+        Two pages must surface as one lazy stream of FileInfo rows, in
+        page order.
+        """
+        pages = [
+            {'files': [{'id': 'file1', 'name': 'a.txt', 'mimeType': 'text/plain',
+                        'modifiedTime': '2024-01-01T00:00:00Z'}],
+             'nextPageToken': 'page2'},
+            {'files': [{'id': 'file2', 'name': 'b.txt', 'mimeType': 'text/plain',
+                        'modifiedTime': '2024-01-01T00:00:00Z'}]},
+        ]
+        self.mock_service.files().list().execute.side_effect = pages
+
+        result = list(self.drive_service.iter_files())
+        self.assertEqual([f.id for f in result], ['file1', 'file2'])
+
+    def test_get_folder_path_uses_folder_index(self):
+        """Test breadcrumb resolution through the bulk folder index.
+
+        Verifies the path is reconstructed from a single folder listing
+        instead of one request per ancestor.
+        """
+        mock_response = {'files': [
+            {'id': 'parent_id', 'name': 'Parent', 'parents': []},
+            {'id': 'child_id', 'name': 'Child', 'parents': ['parent_id']}
+        ]}
+        self.mock_service.files().list().execute.return_value = mock_response
+
+        result = self.drive_service.get_folder_path('child_id')
+        self.assertEqual([p.name for p in result], ['Parent', 'Child'])
+
+    def test_dashboard_bundle_cached_briefly(self):
+        """Test the short-TTL dashboard bundle cache.
+
+        A repeat render within the TTL must not touch the API; an
+        upload into the folder must invalidate it.
+        """
+        def make_batch(callback=None):
+            batch = Mock()
+            batch.add.side_effect = lambda request, request_id=None: \
+                callback(request_id, {'files': []}, None)
+            return batch
+
+        self.mock_service.new_batch_http_request.side_effect = make_batch
+
+        first = self.drive_service.fetch_dashboard_bundle('root')
+        second = self.drive_service.fetch_dashboard_bundle('root')
+        self.assertEqual(first, second)
+        self.assertEqual(self.mock_service.new_batch_http_request.call_count, 1)
+
+        with patch.object(self.drive_service.file_operation, 'upload',
+                          return_value='new_id'):
+            self.drive_service.upload_file('test.txt', 'root')
+        self.drive_service.fetch_dashboard_bundle('root')
+        self.assertEqual(self.mock_service.new_batch_http_request.call_count, 2)
+
+    def test_dashboard_bundle_busts_on_token_change(self):
+        """Test that an advanced changes token bypasses the bundle cache.
+
+        The dashboard stamps its response with the current token as an
+        ETag; serving a bundle built under an older token would pin the
+        stale listing until the next drive change, so the cache entry
+        must be discarded when the token moves on.
+        """
+        def make_batch(callback=None):
+            batch = Mock()
+            batch.add.side_effect = lambda request, request_id=None: \
+                callback(request_id, {'files': []}, None)
+            return batch
+
+        self.mock_service.new_batch_http_request.side_effect = make_batch
+
+        self.drive_service.fetch_dashboard_bundle('root', changes_token='t0')
+        self.drive_service.fetch_dashboard_bundle('root', changes_token='t0')
+        self.assertEqual(self.mock_service.new_batch_http_request.call_count, 1)
+
+        # An external change advanced the token: same folder, new token
+        self.drive_service.fetch_dashboard_bundle('root', changes_token='t1')
+        self.assertEqual(self.mock_service.new_batch_http_request.call_count, 2)
+
+    def test_listing_primes_metadata_cache(self):
+        """Test that listed children need no follow-up get() calls.
+
+        The listing already carries name and parent, so lookups for a
+        listed ID must be answered from the cache.
+        """
+        mock_response = {'files': [{
+            'id': 'file1',
+            'name': 'test1.txt',
+            'mimeType': 'text/plain',
+            'modifiedTime': '2024-01-01T00:00:00Z',
+            'parents': ['folder_id'],
+            'size': '12'
+        }]}
+        self.mock_service.files().list().execute.return_value = mock_response
+        self.drive_service.list_files('folder_id')
+
+        with patch.object(self.drive_service.file_metadata, 'get_name') as mock_name, \
+             patch.object(self.drive_service.file_metadata, 'get_parent') as mock_parent, \
+             patch.object(self.drive_service.file_metadata, 'get_info') as mock_info:
+            self.assertEqual(self.drive_service.get_file_name('file1'), 'test1.txt')
+            self.assertEqual(self.drive_service.get_file_parent('file1'), 'folder_id')
+            self.assertEqual(self.drive_service.get_file_info('file1')['size'], '12')
+            mock_name.assert_not_called()
+            mock_parent.assert_not_called()
+            mock_info.assert_not_called()
+
+    def test_file_name_served_from_cache(self):
+        """Test that repeated name lookups hit the metadata cache.
+
+        The second call must return from memory without another
+        files().get round trip, and deletion must invalidate the entry.
+        """
+        with patch.object(self.drive_service.file_metadata, 'get_name') as mock_get:
+            mock_get.return_value = 'test_file.txt'
+            self.drive_service.get_file_name('test_file_id')
+            self.drive_service.get_file_name('test_file_id')
+            self.assertEqual(mock_get.call_count, 1)
+
+            with patch.object(self.drive_service.file_operation, 'delete'):
+                self.drive_service.delete_file('test_file_id')
+            self.drive_service.get_file_name('test_file_id')
+            self.assertEqual(mock_get.call_count, 2)
+
     def test_upload_file_success(self):
         # Create a temporary test file
         test_file_path = 'test_upload.txt'
@@ -200,8 +552,8 @@ class TestGoogleDriveService(unittest.TestCase):
         with patch.object(self.drive_service.file_operation, 'download') as mock_download:
             mock_download.return_value = io.BytesIO(b'test content')
             result = self.drive_service.download_file('test_file_id')
-            self.assertIsInstance(result, io.BytesIO)
-            mock_download.assert_called_once_with('test_file_id')
+            self.assertEqual(result.read(), b'test content')
+            mock_download.assert_called_once_with('test_file_id', None)
             
     def test_delete_file_success(self):
         with patch.object(self.drive_service.file_operation, 'delete') as mock_delete:
@@ -0,0 +1,16 @@
+# gevent must patch the standard library before anything else imports
+# socket/ssl, so this has to stay at the very top of the entry point
+from gevent import monkey
+monkey.patch_all()
+
+from app import app  # noqa: E402
+from services.google_auth import auth as _auth  # noqa: E402
+
+# Warm the Drive service constructor while the worker is still booting.
+# The discovery document is already parsed at import; this throwaway
+# build also runs the resource-tree construction once, so the first
+# authenticated request doesn't pay any cold-path cost
+_auth.get_drive_service(None)
+
+if __name__ == '__main__':
+    app.run()